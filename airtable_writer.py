@@ -0,0 +1,174 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from requests.exceptions import ConnectionError, HTTPError, Timeout
+
+from rate_limiter import TokenBucket
+from run_report import RUN_REPORT
+
+# Airtable limits: 5 requests/second per base, 10 records per write request
+AIRTABLE_RATE_LIMIT = 5
+AIRTABLE_BATCH_SIZE = 10
+
+MAX_IN_FLIGHT = 4
+MAX_RETRIES = 5
+
+# Airtable asks clients to wait 30s after a 429 before retrying
+RATE_LIMIT_BACKOFF = 30
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class BatchWriter:
+    """Shared Airtable writer: concurrent batches under one per-base token bucket.
+
+    Every create/update/upsert/delete is split into batches of 10 that run on a
+    small thread pool. Each request takes a token first, so the pool as a whole
+    never exceeds the per-base rate limit. A 429 pauses the bucket for every
+    worker; 5xx and connection errors back off exponentially with jitter.
+    Creates are only retried after a 429, which Airtable rejects before
+    writing anything: a create that failed with a 5xx or timed out may have
+    gone through, and retrying it would duplicate the rows. Per-step
+    throughput is collected with `step()`.
+    """
+
+    def __init__(self, rate=AIRTABLE_RATE_LIMIT, max_in_flight=MAX_IN_FLIGHT,
+                 max_retries=MAX_RETRIES):
+        # Capacity 1 spaces requests evenly so no 1s window exceeds the limit
+        self.bucket = TokenBucket(rate, capacity=1)
+        self.pool = ThreadPoolExecutor(max_workers=max_in_flight)
+        self.max_retries = max_retries
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.stats = {}
+
+    # ── Step accounting ──────────────────────────────────────
+
+    @contextmanager
+    def step(self, name):
+        """Attribute all calls made inside the block to `name` and report on exit."""
+        stats = self.stats.setdefault(name, {
+            'calls': 0, 'records': 0, 'retries': 0, 'rate_limited': 0, 'seconds': 0.0,
+        })
+        previous, self.local.stats = self._current(), stats
+        start = time.monotonic()
+        try:
+            yield stats
+        finally:
+            stats['seconds'] += time.monotonic() - start
+            self.local.stats = previous
+            if stats['calls']:
+                rate = stats['calls'] / stats['seconds'] if stats['seconds'] else 0
+                print(f"  ⏱  {name}: {stats['calls']} API calls, {stats['records']} records "
+                      f"in {stats['seconds']:.1f}s ({rate:.1f} req/s, "
+                      f"{stats['retries']} retries, {stats['rate_limited']} rate-limited)")
+
+    def _current(self):
+        return getattr(self.local, 'stats', None)
+
+    def _count(self, key, n=1):
+        RUN_REPORT.count(f'airtable_{key}', n)
+        stats = self._current()
+        if stats is not None:
+            with self.lock:
+                stats[key] += n
+
+    # ── Requests ─────────────────────────────────────────────
+
+    def call(self, fn, *args, records=0, idempotent=True, **kwargs):
+        """Run one Airtable request under the rate limit, retrying transient errors.
+
+        Requests that are not `idempotent` are only retried after a 429.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            self._count('calls')
+            try:
+                result = fn(*args, **kwargs)
+            except HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status not in RETRY_STATUSES or attempt == self.max_retries:
+                    raise
+                if status == 429:
+                    self._count('rate_limited')
+                    self.bucket.pause(RATE_LIMIT_BACKOFF)
+                elif not idempotent:
+                    raise
+                else:
+                    time.sleep(_backoff(attempt))
+            except (ConnectionError, Timeout):
+                if not idempotent or attempt == self.max_retries:
+                    raise
+                time.sleep(_backoff(attempt))
+            else:
+                self._count('records', records)
+                return result
+            self._count('retries')
+
+    def _batches(self, fn, items, idempotent=True, **kwargs):
+        """Run `fn` on each batch of 10 concurrently; yields results in batch order."""
+        chunks = [items[i:i + AIRTABLE_BATCH_SIZE]
+                  for i in range(0, len(items), AIRTABLE_BATCH_SIZE)]
+        stats = self._current()
+
+        def run(chunk):
+            # Worker threads report into the step that submitted the work
+            self.local.stats = stats
+            return self.call(fn, chunk, records=len(chunk), idempotent=idempotent, **kwargs)
+
+        return self.pool.map(run, chunks)
+
+    def _map(self, fn, items, **kwargs):
+        results = []
+        for result in self._batches(fn, items, **kwargs):
+            results.extend(result)
+        return results
+
+    def fetch_all(self, table, **options):
+        """Read every record of a table, one rate-limited request per page."""
+        records = []
+        params = {'pageSize': 100, **options}
+        while True:
+            page = self.call(table.api.get, table.urls.records, params=params)
+            records.extend(page.get('records', []))
+            if not page.get('offset'):
+                return records
+            params['offset'] = page['offset']
+
+    def create(self, table, records):
+        return self._map(table.batch_create, list(records), idempotent=False)
+
+    def update(self, table, records):
+        return self._map(table.batch_update, list(records))
+
+    def upsert(self, table, records, key_fields):
+        """Create or update records in one pass (Airtable's performUpsert).
+
+        Records carrying an 'id' update that record; the rest update the
+        record whose `key_fields` match, or are created. Returns pyairtable's
+        upsert result merged across batches.
+        """
+        merged = {'records': [], 'createdRecords': [], 'updatedRecords': []}
+        for result in self._batches(table.batch_upsert, list(records), key_fields=key_fields):
+            for key in merged:
+                merged[key].extend(result[key])
+        return merged
+
+    def delete(self, table, record_ids):
+        return self._map(table.batch_delete, list(record_ids))
+
+    def clear(self, table):
+        """Delete every record in the table; returns how many were removed."""
+        ids = [r['id'] for r in self.fetch_all(table)]
+        self.delete(table, ids)
+        return len(ids)
+
+    def close(self):
+        self.pool.shutdown()
+
+
+def _backoff(attempt):
+    """Exponential backoff with full jitter, capped at 30s."""
+    return random.uniform(0, min(30, 2 ** attempt))
@@ -0,0 +1,203 @@
+import asyncio
+import queue
+import random
+import threading
+
+import httpx
+
+from bvp_jobs_analyzer import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PREFETCH_PAGES, REQUESTS_PER_SECOND, SEARCH_JOBS_URL,
+    build_payload, next_sequence,
+)
+from rate_limiter import AsyncTokenBucket
+from run_report import RUN_REPORT
+
+# One retry policy for the whole backend: no urllib3 layer underneath
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+DEFAULT_CONCURRENCY = 4
+
+
+class FetchError(Exception):
+    """A search-jobs request that still failed after MAX_ATTEMPTS."""
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff; a server Retry-After wins when given."""
+    if retry_after is not None:
+        return retry_after
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+async def post_with_retry(client, limiter, semaphore, url, payload, label):
+    """POST one page, retrying transport errors, 429s and 5xx with jittered backoff."""
+    for attempt in range(MAX_ATTEMPTS):
+        retry_after = None
+        async with semaphore:
+            await limiter.acquire()
+            RUN_REPORT.count("http_requests")
+            try:
+                response = await client.post(url, json=payload)
+            except httpx.TransportError as e:
+                print(f"  [{label}] Connection error: {e!r}")
+            else:
+                RUN_REPORT.count("http_bytes", len(response.content))
+                if response.status_code == 200:
+                    return response
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                print(f"  [{label}] Error: {response.status_code}")
+                header = response.headers.get("Retry-After")
+                if header and header.isdigit():
+                    retry_after = int(header)
+        RUN_REPORT.count("http_errors")
+        if attempt < MAX_ATTEMPTS - 1:
+            RUN_REPORT.count("http_retries")
+            await asyncio.sleep(backoff_delay(attempt, retry_after))
+    raise FetchError(f"[{label}] gave up after {MAX_ATTEMPTS} attempts")
+
+
+async def fetch_shard_async(client, limiter, semaphore, query=None, page_size=MAX_PAGE_SIZE,
+                            label="all", url=None, sink=None, checkpoint=None):
+    """Fetch every page of one shard, following `sequence` tokens.
+
+    Pages are returned as a list, or handed to the coroutine `sink` one at a
+    time when it is given. With a `checkpoint`, saved pages are replayed and
+    the crawl resumes after them.
+    """
+    url = url or SEARCH_JOBS_URL
+    pages = []
+    count = 0
+    sequence = None
+    fetched = 0
+
+    if checkpoint and checkpoint.pages:
+        print(f"  [{label}] Resuming from checkpoint: {checkpoint.pages} pages, {checkpoint.fetched} jobs")
+        for data in checkpoint.replay():
+            if sink is None:
+                pages.append(data)
+            else:
+                await sink(data)
+        if checkpoint.complete:
+            return pages
+        sequence, fetched = checkpoint.sequence, checkpoint.fetched
+        page_size = checkpoint.page_size or page_size
+        count = checkpoint.pages
+
+    while True:
+        payload = build_payload(sequence, page_size, query)
+        try:
+            response = await post_with_retry(client, limiter, semaphore, url, payload, label)
+        except FetchError as e:
+            print(f"  {e}. Continuing with {fetched} jobs fetched so far.")
+            return pages
+
+        if response.status_code in (400, 422) and page_size > DEFAULT_PAGE_SIZE:
+            print(f"  [{label}] Page size {page_size} rejected, falling back to {DEFAULT_PAGE_SIZE}")
+            page_size = DEFAULT_PAGE_SIZE
+            continue
+        if response.status_code != 200:
+            print(f"  [{label}] Error: {response.status_code}, stopping")
+            return pages
+
+        data = response.json()
+        count += 1
+        jobs_data = data.get("jobs")
+        if isinstance(jobs_data, list):
+            fetched += len(jobs_data)
+        print(f"  [{label}] Page {count}: {fetched} jobs so far (Total: {data.get('total', 'unknown')})")
+        sequence = next_sequence(data, sequence, fetched, label)
+        if checkpoint:
+            checkpoint.save(data, sequence, fetched, page_size)
+        if sink is None:
+            pages.append(data)
+        else:
+            await sink(data)
+
+        if sequence is None:
+            return pages
+
+
+async def fetch_pages_async(shards=None, page_size=MAX_PAGE_SIZE, concurrency=DEFAULT_CONCURRENCY,
+                            rate=REQUESTS_PER_SECOND, url=None, sink=None, progress=None):
+    """Crawl all shards on one pooled httpx client; returns pages in shard order.
+
+    `concurrency` bounds both in-flight requests and pooled connections, and
+    `rate` is the shared politeness budget in requests per second. With
+    `sink`, pages are streamed to it instead and an empty list is returned.
+    `progress` (a CrawlProgress) checkpoints each shard.
+    """
+    shards = shards or [None]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    limiter = AsyncTokenBucket(rate, capacity=max(1, min(len(shards), concurrency)))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        results = await asyncio.gather(*(
+            fetch_shard_async(client, limiter, semaphore, query, page_size,
+                              "all" if query is None else f"shard {i + 1}", url, sink,
+                              progress.shards[i] if progress else None)
+            for i, query in enumerate(shards)
+        ))
+    return [page for shard_pages in results for page in shard_pages]
+
+
+def iter_pages_async(shards=None, page_size=MAX_PAGE_SIZE, concurrency=DEFAULT_CONCURRENCY,
+                     rate=REQUESTS_PER_SECOND, url=None, progress=None):
+    """Synchronous generator over pages crawled by the async backend.
+
+    The event loop runs on a background thread and hands pages over through a
+    bounded queue, so the caller can process one page while the next ones are
+    being fetched. Closing the generator cancels the crawl and waits for the
+    thread, so no page is fetched or checkpointed after it returns.
+    """
+    pages = queue.Queue(maxsize=PREFETCH_PAGES)
+    done = object()
+    stop = threading.Event()
+    tasks = []
+
+    async def sink(data):
+        await asyncio.to_thread(pages.put, data)
+
+    async def crawl():
+        tasks.append(asyncio.current_task())
+        # Closed before the loop started: nothing to cancel, so stop here
+        if not stop.is_set():
+            await fetch_pages_async(shards, page_size, concurrency, rate, url, sink, progress)
+
+    def run():
+        try:
+            asyncio.run(crawl())
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            pages.put(e)
+        finally:
+            pages.put(done)
+
+    thread = threading.Thread(target=run, name="async-fetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            data = pages.get()
+            if data is done:
+                return
+            if isinstance(data, Exception):
+                raise data
+            yield data
+    finally:
+        stop.set()
+        for task in tasks:
+            try:
+                task.get_loop().call_soon_threadsafe(task.cancel)
+            except RuntimeError:  # loop already closed: the crawl finished
+                pass
+        # Unblock a sink still waiting on the full queue until the thread exits
+        while thread.is_alive():
+            try:
+                pages.get(timeout=0.1)
+            except queue.Empty:
+                pass
@@ -0,0 +1,248 @@
+"""Offline benchmarks for the scraper and loader hot paths.
+
+Builds synthetic search-jobs pages (fake_jobs_board.synthetic_jobs) at
+several board sizes and times title classification, analyze_jobs,
+create_dataframe, the loader's filters, dedup and normalization and the
+analytics aggregation. The Airtable steps run against fake_airtable.FakeAirtable,
+which enforces the real 5 requests/second and 10 records per batch limits.
+
+Each run is appended to a JSON Lines file and compared with the previous
+run there, so a change is measured by running before and after it:
+
+    python benchmark.py                              # 5k, 50k and 500k jobs
+    python benchmark.py --sizes 5000 --repeat 5 --label my-change
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from airtable_writer import AIRTABLE_RATE_LIMIT, BatchWriter
+from bvp_jobs_analyzer import (
+    FUNCTION_CLASSIFIER, LEVEL_CLASSIFIER, MAX_PAGE_SIZE, analyze_jobs, collect_jobs,
+    create_dataframe, infer_function_from_title,
+)
+from fake_airtable import FakeAirtable
+from fake_jobs_board import JobsBoard, synthetic_jobs
+from job_dedup import dedupe_jobs
+from load_jobs_to_airtable import (
+    ENHANCED_FUNCTION_CLASSIFIER, build_job_records, compute_analytics, create_weekly_snapshot,
+    enhanced_infer_function, filter_jobs, normalize_functions, update_company_analytics,
+    update_function_analytics, update_talent_pooling, upload_jobs,
+)
+from run_report import peak_rss_mb
+
+BENCHMARK_OUTPUT = '.cache/benchmarks.jsonl'
+DEFAULT_SIZES = [5000, 50000, 500000]
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the progress output of the code under test."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def cold_classifiers():
+    """Forget memoized titles so every repetition classifies from scratch."""
+    for classifier in (FUNCTION_CLASSIFIER, LEVEL_CLASSIFIER, ENHANCED_FUNCTION_CLASSIFIER):
+        classifier.cache = None
+        classifier._lookup.cache_clear()
+
+
+def board_pages(jobs):
+    """The search-jobs pages a full crawl of `jobs` would return."""
+    board = JobsBoard(jobs=jobs, max_page_size=MAX_PAGE_SIZE)
+    pages, sequence = [], None
+    while True:
+        page = board.page({'meta': {'size': MAX_PAGE_SIZE, 'sequence': sequence}})
+        if not page['jobs']:
+            return pages
+        pages.append(page)
+        sequence = page['meta']['sequence']
+
+
+def timed(fn, repeat):
+    """Run `fn` `repeat` times on cold caches; returns (seconds per run, last result)."""
+    seconds = []
+    for _ in range(repeat):
+        cold_classifiers()
+        start = time.perf_counter()
+        with quiet():
+            result = fn()
+        seconds.append(time.perf_counter() - start)
+    return seconds, result
+
+
+def bench_pipeline(n, pages, repeat, only):
+    """Time each scraper and loader stage on an `n`-job board."""
+    results = []
+    state = {}
+
+    def run(name, fn):
+        if only and name not in only:
+            # Later stages still need the output of skipped ones
+            with quiet():
+                state[name] = fn()
+            return
+        seconds, state[name] = timed(fn, repeat)
+        results.append({
+            'benchmark': name,
+            'jobs': n,
+            'best_seconds': round(min(seconds), 4),
+            'median_seconds': round(statistics.median(seconds), 4),
+            'repeat': repeat,
+        })
+        print(f"  {name:28s} {n:>8d} jobs  best {min(seconds):8.3f}s")
+
+    run('collect_jobs', lambda: collect_jobs(pages))
+    jobs = state['collect_jobs']
+    titles = [job.title for job in jobs]
+    run('infer_function_from_title', lambda: [infer_function_from_title(t) for t in titles])
+    run('enhanced_infer_function', lambda: [enhanced_infer_function(t) for t in titles])
+    run('analyze_jobs', lambda: analyze_jobs(jobs))
+    _, functions, levels, _ = state['analyze_jobs']
+    run('create_dataframe', lambda: create_dataframe(jobs, functions, levels, categorical=True))
+    run('filter_jobs', lambda: filter_jobs(state['create_dataframe'])[0])
+    # Synthetic boards repeat titles far more than real ones, so later stages
+    # keep using the undeduplicated frame to stay comparable across runs
+    run('dedupe_jobs', lambda: dedupe_jobs(state['filter_jobs'])[0])
+    run('normalize_functions', lambda: normalize_functions(state['filter_jobs']))
+    run('compute_analytics', lambda: compute_analytics(state['normalize_functions']))
+    now = datetime.now(timezone.utc).isoformat()
+    run('build_job_records', lambda: build_job_records(state['normalize_functions'], now))
+    return results, state['normalize_functions'], state['compute_analytics']
+
+
+def bench_airtable(n, df, metrics, rate):
+    """Sync every table into an empty fake base, then again with nothing changed."""
+    base = FakeAirtable(rate=rate)
+    results = []
+    for name in ('airtable_initial_sync', 'airtable_resync'):
+        writer = BatchWriter(rate=rate)
+        with quiet(), writer.step(name) as stats:
+            start = time.perf_counter()
+            upload_jobs(df, base, writer)
+            update_function_analytics(metrics, base, writer)
+            update_company_analytics(metrics, base, writer, {})
+            create_weekly_snapshot(metrics, base, writer)
+            update_talent_pooling(metrics, base, writer)
+            seconds = time.perf_counter() - start
+        writer.close()
+        results.append({
+            'benchmark': name,
+            'jobs': n,
+            'best_seconds': round(seconds, 4),
+            'median_seconds': round(seconds, 4),
+            'repeat': 1,
+            'calls': stats['calls'],
+            'records': stats['records'],
+            'rate_limited': stats['rate_limited'],
+            # What the same calls cost against the real base
+            'seconds_at_airtable_limit': round(stats['calls'] / AIRTABLE_RATE_LIMIT, 1),
+        })
+        print(f"  {name:28s} {n:>8d} jobs  {seconds:8.3f}s  ({stats['calls']} calls, "
+              f"{stats['records']} records, {stats['rate_limited']} rate-limited)")
+    return results
+
+
+def git_revision():
+    try:
+        out = subprocess.run(['git', 'describe', '--always', '--dirty'],
+                             capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def previous_results(path):
+    """(benchmark, jobs) → result from the most recent run stored in `path`."""
+    if not os.path.exists(path):
+        return None, {}
+    last = None
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                last = json.loads(line)
+    if last is None:
+        return None, {}
+    return last, {(r['benchmark'], r['jobs']): r for r in last['results']}
+
+
+def print_comparison(results, previous, baseline):
+    print("\n" + "=" * 72)
+    if baseline:
+        name = baseline.get('label') or baseline.get('revision') or 'previous run'
+        print(f"Compared with {name} "
+              f"({baseline['started_at']})")
+    print(f"{'benchmark':28s} {'jobs':>8s} {'best':>10s} {'previous':>10s} {'change':>8s}")
+    print("-" * 72)
+    for r in results:
+        old = previous.get((r['benchmark'], r['jobs']))
+        line = f"{r['benchmark']:28s} {r['jobs']:>8d} {r['best_seconds']:>9.3f}s"
+        if old and old['best_seconds']:
+            change = (r['best_seconds'] - old['best_seconds']) / old['best_seconds']
+            line += f" {old['best_seconds']:>9.3f}s {change:>+8.1%}"
+        print(line)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the jobs pipeline on synthetic boards")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="board sizes (number of jobs) to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark (best is kept)")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="only time these benchmarks")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic board seed")
+    parser.add_argument("--airtable-max-jobs", type=int, default=5000,
+                        help="largest board to sync into the fake Airtable base (0 to skip)")
+    parser.add_argument("--airtable-rate", type=float, default=AIRTABLE_RATE_LIMIT,
+                        help="requests/second allowed by the fake base (and used by the writer)")
+    parser.add_argument("--output", default=BENCHMARK_OUTPUT, help="JSON Lines file results are appended to")
+    parser.add_argument("--label", help="name for this run, shown when later runs compare against it")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    baseline, previous = previous_results(args.output)
+    started = datetime.now(timezone.utc)
+
+    results = []
+    for n in args.sizes:
+        print(f"\nGenerating {n} synthetic jobs...")
+        pages = board_pages(synthetic_jobs(n, seed=args.seed, descriptions=False))
+        stage_results, df, metrics = bench_pipeline(n, pages, args.repeat, args.only)
+        results.extend(stage_results)
+        if n <= args.airtable_max_jobs and (not args.only or any(b.startswith('airtable') for b in args.only)):
+            results.extend(bench_airtable(n, df, metrics, args.airtable_rate))
+
+    run = {
+        'started_at': started.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'label': args.label,
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'seed': args.seed,
+        'peak_rss_mb': peak_rss_mb(),
+        'results': results,
+    }
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "a") as f:
+        f.write(json.dumps(run) + "\n")
+
+    print_comparison(results, previous, baseline)
+    print(f"\n💾 Results appended to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,26 @@
 import requests
+import argparse
+import csv
+import itertools
 import json
+import os
+import queue
+import sys
+import threading
 import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 import pandas as pd
 import re
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from crawl_checkpoint import CrawlProgress, shard_label
+from rate_limiter import TokenBucket
+from run_report import RUN_REPORT
+from title_classifier import KeywordClassifier, attach_cache
+
 def create_session_with_retries():
     """Create a requests session with retry logic"""
     session = requests.Session()
@@ -22,327 +36,752 @@ def create_session_with_retries():
     session.mount('https://', adapter)
     return session
 
-def infer_function_from_title(title):
-    """Infer function/department from job title when not provided"""
-    if not title:
-        return "Unknown"
-    
-    title_lower = title.lower()
-    
+# Ordered (function, keywords[, unless]) rules: the first rule with a keyword
+# in the lowercased title wins; `unless` words skip that rule.
+FUNCTION_RULES = [
     # Finance & Accounting (check early to avoid conflicts with "operations")
-    if any(word in title_lower for word in [
+    ("Finance", [
         'fp&a', 'fpa', 'finance', 'accounting', 'accountant', 'controller', 'cfo',
         'financial', 'tax', 'audit', 'payroll', 'bookkeeper', 'accounts payable',
         'accounts receivable', 'treasury'
-    ]):
-        return "Finance"
-    
+    ]),
     # Legal & Compliance (check early)
-    if any(word in title_lower for word in [
+    ("Legal & Compliance", [
         'legal', 'counsel', 'attorney', 'compliance', 'regulatory',
         'privacy', 'contracts', 'grc', 'governance'
-    ]):
-        return "Legal & Compliance"
-    
+    ]),
     # People/HR (check before Operations to catch "People Operations")
-    if any(word in title_lower for word in [
+    ("People & Talent", [
         'recruiter', 'recruiting', 'talent acquisition', 'talent', 'people business partner',
         'people partner', 'people enablement', 'hr ', 'hrbp', 'human resources',
         'total rewards', 'people operations', 'people analytics', 'people experience'
-    ]):
-        return "People & Talent"
-    
+    ]),
     # Engineering & Technical
-    if any(word in title_lower for word in [
-        'engineer', 'developer', 'software', 'sre', 'devops', 'architect', 
+    ("Engineering", [
+        'engineer', 'developer', 'software', 'sre', 'devops', 'architect',
         'infrastructure', 'backend', 'frontend', 'fullstack', 'full stack',
         'mobile', 'ios', 'android', 'qa', 'sdet', 'technical program', 'firmware',
         'embedded', 'hardware engineer', 'test engineer'
-    ]):
-        return "Engineering"
-    
+    ]),
     # Sales & Business Development
-    if any(word in title_lower for word in [
+    ("Sales", [
         'account executive', 'sales', 'business development', 'bdr', 'sdr',
         'account manager', 'account director', 'partnership manager',
         'sales development', 'revenue', 'commercial', 'inside sales',
         'enterprise sales', 'gtm manager', 'relationship manager', 'key account'
-    ]):
-        return "Sales"
-    
+    ]),
     # Marketing (check before Operations)
-    if any(word in title_lower for word in [
+    ("Marketing", [
         'marketing', 'growth marketing', 'demand gen', 'content', 'seo',
         'brand', 'campaigns', 'lifecycle marketing', 'product marketing',
         'growth marketer', 'social media', 'communications', 'public affairs',
         'community manager'
-    ]):
-        return "Marketing"
-    
-    # Product Management
-    if any(word in title_lower for word in [
+    ]),
+    # Product Management (exclude "product support" and "product operations",
+    # which will be caught by other categories)
+    ("Product", [
         'product manager', 'product lead', 'product owner',
         'product director', 'product analyst', 'product designer'
-    ]):
-        # Exclude "product support" and "product operations"
-        if 'support' in title_lower or 'operations' in title_lower:
-            pass  # Will be caught by other categories
-        else:
-            return "Product"
-    
+    ], ['support', 'operations']),
     # Design
-    if any(word in title_lower for word in [
+    ("Design", [
         'designer', 'design', 'ux', 'ui', 'creative', 'visual'
-    ]):
-        return "Design"
-    
+    ]),
     # Data & Analytics
-    if any(word in title_lower for word in [
+    ("Data & Analytics", [
         'data scientist', 'data analyst', 'data engineer', 'analytics',
         'machine learning', 'ml engineer', 'ai researcher', 'data science',
         'data specialist', 'data platform'
-    ]):
-        return "Data & Analytics"
-    
+    ]),
     # Customer Success & Support (check before Operations)
-    if any(word in title_lower for word in [
+    ("Customer Success", [
         'customer success', 'customer experience', 'customer support',
         'technical support', 'implementation manager', 'customer care',
         'customer architect', 'customer education', 'support specialist',
         'support engineer', 'customer strategy'
-    ]):
-        return "Customer Success"
-    
+    ]),
     # IT & Systems
-    if any(word in title_lower for word in [
+    ("IT", [
         'it support', 'it engineer', 'it administrator', 'it specialist',
         'systems admin', 'helpdesk', 'desktop support', 'salesforce admin',
         'it governance', 'it planning', 'it cloud', 'service desk'
-    ]):
-        return "IT"
-    
+    ]),
     # Strategy & Business Development (check before Operations)
-    if any(word in title_lower for word in [
+    ("Strategy & Business Development", [
         'strategy', 'strategic', 'business development', 'partnerships',
         'corp dev', 'corporate development', 'chief of staff'
-    ]):
-        return "Strategy & Business Development"
-    
+    ]),
     # Operations (check last as it's broad)
-    if any(word in title_lower for word in [
+    ("Operations", [
         'operations', 'ops manager', 'ops specialist', 'ops generalist',
         'office manager', 'business operations', 'program manager',
         'project manager', 'executive assistant', 'admin', 'procurement',
         'process', 'implementation specialist', 'solutions operations',
         'gtm operations', 'product operations', 'fraud analyst'
-    ]):
-        return "Operations"
-    
+    ]),
     # Professional Services
-    if any(word in title_lower for word in [
+    ("Professional Services", [
         'professional services', 'consulting', 'consultant', 'solutions architect'
-    ]):
-        return "Professional Services"
-    
-    return "Unknown"
+    ]),
+]
 
-def fetch_all_bvp_jobs():
-    """Fetch all jobs from BVP job board using pagination with retry logic"""
-    url = "https://jobs.bvp.com/api-boards/search-jobs"
-    all_jobs = []
+LEVEL_RULES = [
+    ("Executive", ["vp", "vice president", "head of", "chief", "ceo", "cto", "cfo", "coo"]),
+    ("Director/Lead", ["director"]),
+    ("Director/Lead", ["lead"], ["lead generation"]),
+    ("Senior", ["senior", "sr.", "sr ", "staff", "principal"]),
+    ("Junior", ["junior", "jr.", "jr ", "associate", "entry"]),
+]
+
+FUNCTION_CLASSIFIER = KeywordClassifier(FUNCTION_RULES, default="Unknown")
+LEVEL_CLASSIFIER = KeywordClassifier(LEVEL_RULES, default="Mid-Level")
+
+
+def infer_function_from_title(title):
+    """Infer function/department from job title when not provided"""
+    if not title:
+        return "Unknown"
+    return FUNCTION_CLASSIFIER.classify(title)
+
+
+def infer_level_from_title(title):
+    """Infer seniority level from job title"""
+    return LEVEL_CLASSIFIER.classify(title)
+
+
+def classify_titles(titles):
+    """Vectorized title inference: DataFrame of Function and Level per title.
+
+    Matches infer_function_from_title / infer_level_from_title row for row.
+    """
+    titles = titles if isinstance(titles, pd.Series) else pd.Series(titles, dtype=object)
+    return pd.DataFrame({
+        "Function": FUNCTION_CLASSIFIER.classify_series(titles),
+        "Level": LEVEL_CLASSIFIER.classify_series(titles),
+    })
+
+# Override with BVP_JOBS_URL to point the scraper at fake_jobs_board.py
+SEARCH_JOBS_URL = os.environ.get("BVP_JOBS_URL", "https://jobs.bvp.com/api-boards/search-jobs")
+BOARD_ID = "bessemer-ventures"
+
+# Page sizes: ask for MAX first and fall back to DEFAULT if the API rejects it
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Shared politeness budget across all concurrent shards
+REQUESTS_PER_SECOND = 4
+MAX_SHARD_WORKERS = 4
+
+# Pages buffered per shard while the consumer is still processing earlier ones
+PREFETCH_PAGES = 4
+
+
+def build_payload(sequence=None, page_size=DEFAULT_PAGE_SIZE, query=None, board=None):
+    """Build a search-jobs request body; `query` adds shard filters.
+
+    `board` is a --boards entry (see load_boards); the default is BVP's board.
+    """
+    board = board or {}
+    payload = {
+        "board": {
+            "id": board.get("id", BOARD_ID),
+            "isParent": board.get("isParent", True)
+        },
+        "grouped": False,
+        "meta": {
+            "size": page_size
+        },
+        "query": {
+            "promoteFeatured": True,
+            **(query or {})
+        }
+    }
+    if sequence:
+        payload["meta"]["sequence"] = sequence
+    return payload
+
+
+def fetch_pages(session, bucket, query=None, page_size=MAX_PAGE_SIZE, label="all", max_retries=3,
+                checkpoint=None, board=None):
+    """Yield raw search-jobs responses for one shard, following `sequence` tokens.
+
+    Every request takes a token from the shared `bucket` instead of sleeping
+    a fixed interval. If the API rejects an oversized page, the shard drops
+    to DEFAULT_PAGE_SIZE and carries on. With a `checkpoint`, pages saved by
+    an interrupted run are replayed first and the crawl resumes after them.
+    `board` selects another Getro-style board than BVP's.
+    """
+    url = board["url"] if board else SEARCH_JOBS_URL
     sequence = None
     page = 1
-    max_retries = 3
-    
-    # Create session with retry logic
-    session = create_session_with_retries()
-    
+    fetched = 0
+
+    if checkpoint and checkpoint.pages:
+        print(f"  [{label}] Resuming from checkpoint: {checkpoint.pages} pages, {checkpoint.fetched} jobs")
+        yield from checkpoint.replay()
+        if checkpoint.complete:
+            return
+        sequence, fetched = checkpoint.sequence, checkpoint.fetched
+        page_size = checkpoint.page_size or page_size
+        page = checkpoint.pages + 1
+
     while True:
-        payload = {
-            "board": {
-                "id": "bessemer-ventures",
-                "isParent": True
-            },
-            "grouped": False,
-            "meta": {
-                "size": 100
-            },
-            "query": {
-                "promoteFeatured": True
-            }
-        }
-        
-        if sequence:
-            payload["meta"]["sequence"] = sequence
-        
-        print(f"Fetching page {page}...")
-        
-        # Try the request with retries
+        data = None
         for attempt in range(max_retries):
+            bucket.acquire()
+            RUN_REPORT.count("http_requests")
             try:
-                response = session.post(url, json=payload, timeout=30)
-                
-                if response.status_code != 200:
-                    print(f"Error: {response.status_code}")
-                    if attempt < max_retries - 1:
-                        print(f"  Retrying... (attempt {attempt + 2}/{max_retries})")
-                        time.sleep(2 ** attempt)  # Exponential backoff
-                        continue
-                    else:
-                        break
-                
-                data = response.json()
-                
-                if "jobs" in data:
-                    jobs_data = data["jobs"]
-                    if isinstance(jobs_data, list):
-                        all_jobs.extend(jobs_data)
-                
-                print(f"  Fetched {len(all_jobs)} jobs so far (Total: {data.get('total', 'unknown')})")
-                
-                total = data.get('total', 0)
-                if len(all_jobs) >= total:
-                    print(f"  Reached total! Stopping.")
-                    return all_jobs
-                
-                if "meta" in data and "sequence" in data["meta"]:
-                    new_sequence = data["meta"]["sequence"]
-                    if new_sequence == sequence:
-                        print(f"  Sequence didn't change, stopping")
-                        return all_jobs
-                    sequence = new_sequence
-                    page += 1
-                    time.sleep(1)  # Increased delay to be nicer to the API
-                    break  # Success, exit retry loop
-                else:
-                    print(f"  No sequence found, stopping")
-                    return all_jobs
-                    
+                response = session.post(url, json=build_payload(sequence, page_size, query, board), timeout=30)
             except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
-                print(f"  Connection error: {e}")
+                print(f"  [{label}] Connection error: {e}")
+                RUN_REPORT.count("http_errors")
+                if attempt < max_retries - 1:
+                    RUN_REPORT.count("http_retries")
+                    time.sleep(2 ** attempt)
+                continue
+            RUN_REPORT.count("http_bytes", len(response.content))
+
+            if response.status_code in (400, 422) and page_size > DEFAULT_PAGE_SIZE:
+                print(f"  [{label}] Page size {page_size} rejected, falling back to {DEFAULT_PAGE_SIZE}")
+                page_size = DEFAULT_PAGE_SIZE
+                continue
+            if response.status_code != 200:
+                print(f"  [{label}] Error: {response.status_code}")
+                RUN_REPORT.count("http_errors")
                 if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    print(f"  Waiting {wait_time} seconds before retry...")
-                    time.sleep(wait_time)
+                    print(f"  [{label}] Retrying... (attempt {attempt + 2}/{max_retries})")
+                    RUN_REPORT.count("http_retries")
+                    time.sleep(2 ** attempt)  # Exponential backoff
+                continue
+
+            data = response.json()
+            break
+
+        if data is None:
+            print(f"  [{label}] Max retries reached. Continuing with {fetched} jobs fetched so far.")
+            return
+
+        jobs_data = data.get("jobs")
+        if isinstance(jobs_data, list):
+            fetched += len(jobs_data)
+        print(f"  [{label}] Page {page}: {fetched} jobs so far (Total: {data.get('total', 'unknown')})")
+        sequence = next_sequence(data, sequence, fetched, label)
+        if checkpoint:
+            checkpoint.save(data, sequence, fetched, page_size)
+        yield data
+
+        if sequence is None:
+            return
+        page += 1
+
+
+def next_sequence(data, sequence, fetched, label="all"):
+    """Return the token for the next page, or None when the crawl is done."""
+    if fetched >= data.get('total', 0):
+        return None
+    new_sequence = data.get("meta", {}).get("sequence")
+    if not new_sequence:
+        print(f"  [{label}] No sequence found, stopping")
+        return None
+    if new_sequence == sequence:
+        print(f"  [{label}] Sequence didn't change, stopping")
+        return None
+    return new_sequence
+
+
+def _prefetch(pages, out, done, stop):
+    """Drain a page generator into a queue so requests overlap with processing."""
+    try:
+        for data in pages:
+            if stop.is_set():
+                break
+            out.put(data)
+    except Exception as e:
+        out.put(e)
+    finally:
+        out.put(done)
+
+
+def merge_pages(sources, max_workers):
+    """Yield pages from several page generators as they arrive.
+
+    Each generator is drained on a worker thread, which keeps requesting the
+    next page while the caller is still working through earlier ones.
+    """
+    pages = queue.Queue(maxsize=PREFETCH_PAGES * len(sources))
+    done = object()
+    stop = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for source in sources:
+            pool.submit(_prefetch, source, pages, done, stop)
+        remaining = len(sources)
+        try:
+            while remaining:
+                data = pages.get()
+                if data is done:
+                    remaining -= 1
+                elif isinstance(data, Exception):
+                    raise data
                 else:
-                    print(f"  Max retries reached. Continuing with {len(all_jobs)} jobs fetched so far.")
-                    return all_jobs
-    
-    return all_jobs
+                    yield data
+        finally:
+            # Unblock any fetch threads still waiting on a full queue
+            stop.set()
+            while remaining:
+                if pages.get() is done:
+                    remaining -= 1
 
-def analyze_jobs(jobs):
-    """Analyze jobs by function and level"""
-    
-    functions = []
-    levels = []
-    titles = []
-    inferred_count = 0
-    
+
+def iter_shard_pages(shards=None, page_size=MAX_PAGE_SIZE, max_workers=MAX_SHARD_WORKERS,
+                     rate=REQUESTS_PER_SECOND, progress=None):
+    """Yield pages from every shard as they arrive.
+
+    Each shard (a dict of extra query filters; None means the whole board)
+    paginates on its own thread, all of them drawing from one token bucket.
+    `progress` (a CrawlProgress) checkpoints each shard.
+    """
+    shards = shards or [None]
+    session = create_session_with_retries()
+    bucket = TokenBucket(rate, capacity=max(1, min(len(shards), max_workers)))
+    sources = [
+        fetch_pages(session, bucket, query, page_size, shard_label(i, query),
+                    checkpoint=progress.shards[i] if progress else None)
+        for i, query in enumerate(shards)
+    ]
+    yield from merge_pages(sources, min(len(shards), max_workers))
+
+
+def load_boards(path):
+    """Read a --boards file: a JSON list of Getro-style job boards to crawl together.
+
+    Each entry is {"name", "id", "url"} (the board's search-jobs endpoint),
+    optionally with "shards" (query filters, as in --shards) and "isParent".
+    Raises ValueError when an entry is malformed or two boards share a name.
+    """
+    with open(path) as f:
+        boards = json.load(f)
+    if not isinstance(boards, list) or not boards:
+        raise ValueError(f"{path}: expected a non-empty JSON list of boards")
+    names = set()
+    for n, board in enumerate(boards, 1):
+        if not isinstance(board, dict):
+            raise ValueError(f"{path}: board {n} is not an object")
+        missing = [key for key in ("name", "id", "url") if not board.get(key)]
+        if missing:
+            raise ValueError(f"{path}: board {n} is missing {', '.join(missing)}")
+        if board["name"] in names:
+            raise ValueError(f"{path}: duplicate board name {board['name']!r}")
+        names.add(board["name"])
+        board.setdefault("isParent", True)
+        board["shards"] = board.get("shards") or [None]
+    return boards
+
+
+def _tag_pages(pages, board):
+    for data in pages:
+        yield {**data, "board": board}
+
+
+def iter_board_pages(boards, page_size=MAX_PAGE_SIZE, max_workers=MAX_SHARD_WORKERS,
+                     rate=REQUESTS_PER_SECOND, progress=None):
+    """Yield pages from every shard of every board as they arrive.
+
+    Each page carries the name of its board under "board". Every host gets
+    its own token bucket of `rate` requests per second and up to
+    `max_workers` concurrent shards, so boards on different hosts do not
+    wait on each other and the crawl takes about as long as the slowest
+    board. `progress` is a CrawlProgress built with the same `boards`.
+    """
+    session = create_session_with_retries()
+    units = [(board, i, query) for board in boards for i, query in enumerate(board["shards"])]
+    checkpoints = progress.shards if progress else [None] * len(units)
+    by_host = {}
+    for unit, checkpoint in zip(units, checkpoints):
+        by_host.setdefault(urlsplit(unit[0]["url"]).netloc, []).append((unit, checkpoint))
+
+    per_host = []
+    for host_units in by_host.values():
+        bucket = TokenBucket(rate, capacity=max(1, min(len(host_units), max_workers)))
+        per_host.append([
+            _tag_pages(fetch_pages(session, bucket, query, page_size, shard_label(i, query, board["name"]),
+                                   checkpoint=checkpoint, board=board), board["name"])
+            for (board, i, query), checkpoint in host_units
+        ])
+    # Interleave hosts so every host's first shards start right away
+    sources = [source for group in itertools.zip_longest(*per_host) for source in group if source]
+    workers = sum(min(len(group), max_workers) for group in per_host)
+    yield from merge_pages(sources, workers)
+
+
+class JobRecord:
+    """The fields of one API job the pipeline reads, and nothing else.
+
+    Raw search-jobs jobs also carry descriptions, nested location objects
+    and many other fields. Pages are projected into records as they arrive
+    (see project_jobs) so the raw JSON can be freed straight away; repeated
+    strings are interned. `boards` is only set by --boards crawls.
+    """
+    __slots__ = ("title", "company", "department", "location", "url", "remote", "hybrid", "boards")
+
+    def __init__(self, title, company, department, location, url, remote, hybrid, boards=None):
+        self.title = title
+        self.company = company
+        self.department = department
+        self.location = location
+        self.url = url
+        self.remote = remote
+        self.hybrid = hybrid
+        self.boards = boards
+
+
+def _interned(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def project_job(job):
+    """JobRecord for one raw API job dict."""
+    # Department from the API; None means it is inferred from the title
+    departments = job.get("departments", [])
+    department = departments[0] if departments and isinstance(departments, list) else None
+
+    locations = job.get("locations", [])
+    if locations and isinstance(locations, list) and len(locations) > 0:
+        location_name = locations[0]
+    else:
+        normalized_locs = job.get("normalizedLocations", [])
+        if normalized_locs and isinstance(normalized_locs, list) and len(normalized_locs) > 0:
+            if isinstance(normalized_locs[0], dict):
+                location_name = normalized_locs[0].get("label", "Unknown")
+            else:
+                location_name = str(normalized_locs[0])
+        else:
+            location_name = "Unknown"
+
+    return JobRecord(
+        title=_interned(job.get("title", "")),
+        company=_interned(job.get("companyName", "Unknown")),
+        department=_interned(department),
+        location=_interned(location_name),
+        url=job.get("url", "") or job.get("applyUrl", ""),
+        remote=bool(job.get("remote", False)),
+        hybrid=bool(job.get("hybrid", False)),
+    )
+
+
+def project_jobs(jobs):
+    """JobRecords for the dict jobs of one page (anything else is dropped)."""
+    return [project_job(job) for job in jobs if isinstance(job, dict)]
+
+
+def job_identity(job):
+    """Key used to drop jobs that more than one shard returned."""
+    return job.get("id") or job.get("url") or job.get("applyUrl") or (
+        job.get("companyName"), job.get("title"), tuple(job.get("locations") or ()))
+
+
+def board_job_identity(job):
+    """Key for one posting across boards: its URL, else company, title and locations."""
+    return job.get("url") or job.get("applyUrl") or (
+        job.get("companyName"), job.get("title"), tuple(job.get("locations") or ()))
+
+
+def collect_board_jobs(pages, boards):
+    """Flatten pages from several boards into one job list, one entry per posting.
+
+    A posting listed on more than one board is kept once, as a JobRecord
+    whose `boards` lists every board it was found on, in the order of
+    `boards`.
+    """
+    order = {board["name"]: i for i, board in enumerate(boards)}
+    merged = {}
+    for data in pages:
+        jobs_data = data.get("jobs")
+        if not isinstance(jobs_data, list):
+            continue
+        for job in jobs_data:
+            if not isinstance(job, dict):
+                continue
+            key = board_job_identity(job)
+            record = merged.get(key)
+            if record is None:
+                record = merged[key] = project_job(job)
+                record.boards = []
+            if data["board"] not in record.boards:
+                record.boards.append(data["board"])
+    jobs = list(merged.values())
     for job in jobs:
-        if not isinstance(job, dict):
+        job.boards.sort(key=order.get)
+    jobs.sort(key=lambda job: order[job.boards[0]])
+    return jobs
+
+
+def iter_job_batches(pages, dedupe=False, record_dir=None):
+    """Yield the job list of each search-jobs page as it arrives.
+
+    With `dedupe`, jobs already returned by another shard are dropped. With
+    `record_dir`, every raw page is saved so fake_jobs_board.py can replay it.
+    """
+    seen = set()
+    if record_dir:
+        os.makedirs(record_dir, exist_ok=True)
+    for n, data in enumerate(pages, 1):
+        if record_dir:
+            with open(os.path.join(record_dir, f"page_{n:04d}.json"), "w") as f:
+                json.dump(data, f)
+        jobs_data = data.get("jobs")
+        if not isinstance(jobs_data, list):
             continue
-            
-        title = job.get("title", "")
-        
-        # Extract department - try API first, then infer from title
-        departments = job.get("departments", [])
-        if departments and isinstance(departments, list) and len(departments) > 0:
-            department = departments[0]
-        else:
-            department = infer_function_from_title(title)
-            if department != "Unknown":
-                inferred_count += 1
-        
-        titles.append(title)
-        functions.append(department)
-        
-        # Extract level from title
-        title_lower = title.lower()
-        if any(word in title_lower for word in ["vp", "vice president", "head of", "chief", "ceo", "cto", "cfo", "coo"]):
-            level = "Executive"
-        elif "director" in title_lower or ("lead" in title_lower and "lead generation" not in title_lower):
-            level = "Director/Lead"
-        elif any(word in title_lower for word in ["senior", "sr.", "sr ", "staff", "principal"]):
-            level = "Senior"
-        elif any(word in title_lower for word in ["junior", "jr.", "jr ", "associate", "entry"]):
-            level = "Junior"
-        else:
-            level = "Mid-Level"
-        
-        levels.append(level)
-    
-    print(f"\n✨ Inferred function for {inferred_count} jobs from titles")
-    
-    function_counts = Counter(functions)
-    level_counts = Counter(levels)
+        if dedupe:
+            batch = []
+            for job in jobs_data:
+                if isinstance(job, dict):
+                    key = job_identity(job)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                batch.append(job)
+            jobs_data = batch
+        yield jobs_data
+
+
+def collect_jobs(pages, dedupe=False, record_dir=None):
+    """Flatten search-jobs pages into one list of JobRecords, a page at a time."""
+    all_jobs = []
+    for batch in iter_job_batches(pages, dedupe, record_dir):
+        all_jobs.extend(project_jobs(batch))
+    return all_jobs
+
+
+def iter_pages(shards=None, page_size=MAX_PAGE_SIZE, max_workers=MAX_SHARD_WORKERS, backend="requests",
+               progress=None):
+    """Yield raw pages from the chosen backend as they arrive."""
+    if backend == "async":
+        # Imported lazily so httpx is only needed when the async backend is used
+        from async_fetch import iter_pages_async
+        return iter_pages_async(shards, page_size, concurrency=max_workers, progress=progress)
+    return iter_shard_pages(shards, page_size, max_workers, progress=progress)
+
+
+def fetch_all_bvp_jobs(shards=None, page_size=MAX_PAGE_SIZE, max_workers=MAX_SHARD_WORKERS,
+                       backend="requests", record_dir=None, progress=None):
+    """Fetch all jobs from BVP job board, crawling shards concurrently"""
+    pages = iter_pages(shards, page_size, max_workers, backend, progress)
+    all_jobs = collect_jobs(pages, dedupe=bool(shards and len(shards) > 1), record_dir=record_dir)
+    print(f"  Reached end of crawl with {len(all_jobs)} jobs")
+    return all_jobs
+
+def fetch_all_board_jobs(boards, page_size=MAX_PAGE_SIZE, max_workers=MAX_SHARD_WORKERS, progress=None):
+    """Fetch all jobs from several boards concurrently, one entry per posting"""
+    pages = iter_board_pages(boards, page_size, max_workers, progress=progress)
+    all_jobs = collect_board_jobs(pages, boards)
+    counts = Counter(board for job in all_jobs for board in job.boards)
+    shared = sum(len(job.boards) > 1 for job in all_jobs)
+    per_board = ", ".join(f"{board['name']} {counts[board['name']]}" for board in boards)
+    print(f"  Reached end of crawl with {len(all_jobs)} jobs ({per_board}; {shared} on more than one board)")
+    return all_jobs
+
+def classify_jobs(jobs):
+    """Return (titles, functions, levels, inferred_count) for a list of JobRecords."""
+    titles = [job.title for job in jobs]
+    # Department from the API where given, else inferred from the title
+    departments = [job.department for job in jobs]
     
-    report = {
-        "total_jobs": len(jobs),
+    # Classify every title in one vectorized pass
+    classified = classify_titles(titles)
+    given = pd.Series([d is not None for d in departments], dtype=bool)
+    inferred = classified["Function"]
+    functions = inferred.where(~given, pd.Series(departments, dtype=object)).tolist()
+    levels = classified["Level"].tolist()
+    inferred_count = int((~given & (inferred != "Unknown")).sum())
+    return titles, functions, levels, inferred_count
+
+
+def build_report(total_jobs, inferred_count, function_counts, level_counts, title_counts):
+    return {
+        "total_jobs": total_jobs,
         "inferred_functions": inferred_count,
         "by_function": dict(function_counts.most_common()),
         "by_level": dict(level_counts.most_common()),
-        "top_20_titles": Counter(titles).most_common(20)
+        "top_20_titles": title_counts.most_common(20)
     }
+
+
+def analyze_jobs(jobs):
+    """Analyze jobs by function and level"""
+    titles, functions, levels, inferred_count = classify_jobs(jobs)
+    
+    print(f"\n✨ Inferred function for {inferred_count} jobs from titles")
     
+    report = build_report(len(jobs), inferred_count, Counter(functions), Counter(levels), Counter(titles))
     return report, functions, levels, titles
 
-def create_dataframe(jobs, functions, levels):
+OUTPUT_COLUMNS = ["Title", "Company", "Function", "Level", "Location", "Remote", "URL"]
+
+# Handoff schema shared with load_jobs_to_airtable.py; low-cardinality
+# columns are categorical, the rest plain strings
+CATEGORICAL_COLUMNS = ["Company", "Function", "Level", "Remote"]
+OUTPUT_DTYPES = {col: ("category" if col in CATEGORICAL_COLUMNS else "object") for col in OUTPUT_COLUMNS}
+
+# Extra column of --boards crawls: every board listing the job. Not part of
+# the handoff schema, so the loader ignores it.
+BOARD_COLUMN = "Board"
+
+CSV_OUTPUT = "bvp_jobs_analysis.csv"
+PARQUET_OUTPUT = "bvp_jobs_analysis.parquet"
+CHANGES_OUTPUT = "bvp_jobs_changes.csv"
+META_OUTPUT = "bvp_jobs_analysis.meta.json"
+SCRAPE_REPORT_OUTPUT = "bvp_jobs_scrape_report.json"
+
+
+def apply_output_schema(df):
+    """Cast a jobs DataFrame to OUTPUT_DTYPES; raises ValueError on missing columns."""
+    missing = [col for col in OUTPUT_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Jobs data is missing columns: {', '.join(missing)}")
+    df = df[OUTPUT_COLUMNS].astype(OUTPUT_DTYPES)
+    # Sorted categories, so CSV, Parquet and in-memory frames compare equal
+    for col in CATEGORICAL_COLUMNS:
+        values = df[col].cat.remove_unused_categories()
+        df[col] = values.cat.reorder_categories(sorted(values.cat.categories))
+    return df
+
+
+def _arrow_schema(columns=OUTPUT_COLUMNS):
+    import pyarrow as pa
+    return pa.schema([
+        (col, pa.dictionary(pa.int32(), pa.string()) if col in CATEGORICAL_COLUMNS else pa.string())
+        for col in columns
+    ])
+
+
+def job_to_row(job, function, level):
+    """Project one JobRecord onto the output columns."""
+    location_name = job.location
+    remote = job.remote
+    hybrid = job.hybrid
+    
+    if remote:
+        location_name = f"{location_name} (Remote)"
+    elif hybrid:
+        location_name = f"{location_name} (Hybrid)"
+    
+    return {
+        "Title": job.title,
+        "Company": job.company,
+        "Function": function,
+        "Level": level,
+        "Location": location_name,
+        "Remote": "Yes" if remote else ("Hybrid" if hybrid else "No"),
+        "URL": job.url
+    }
+
+
+def create_dataframe(jobs, functions, levels, categorical=False):
     """Create a pandas DataFrame for further analysis"""
-    df_data = []
+    df_data = [job_to_row(job, function, level) for job, function, level in zip(jobs, functions, levels)]
     
-    for job, function, level in zip(jobs, functions, levels):
-        if not isinstance(job, dict):
-            continue
-        
-        company_name = job.get("companyName", "Unknown")
-        
-        locations = job.get("locations", [])
-        if locations and isinstance(locations, list) and len(locations) > 0:
-            location_name = locations[0]
-        else:
-            normalized_locs = job.get("normalizedLocations", [])
-            if normalized_locs and isinstance(normalized_locs, list) and len(normalized_locs) > 0:
-                if isinstance(normalized_locs[0], dict):
-                    location_name = normalized_locs[0].get("label", "Unknown")
-                else:
-                    location_name = str(normalized_locs[0])
-            else:
-                location_name = "Unknown"
-        
-        url = job.get("url", "") or job.get("applyUrl", "")
-        
-        remote = job.get("remote", False)
-        hybrid = job.get("hybrid", False)
-        
-        if remote:
-            location_name = f"{location_name} (Remote)"
-        elif hybrid:
-            location_name = f"{location_name} (Hybrid)"
-        
-        df_data.append({
-            "Title": job.get("title", ""),
-            "Company": company_name,
-            "Function": function,
-            "Level": level,
-            "Location": location_name,
-            "Remote": "Yes" if remote else ("Hybrid" if hybrid else "No"),
-            "URL": url
-        })
+    df = pd.DataFrame(df_data, columns=OUTPUT_COLUMNS)
+    return apply_output_schema(df) if categorical else df
+
+
+def write_parquet(df, path=PARQUET_OUTPUT):
+    """Write the jobs DataFrame as Parquet with the handoff schema (needs pyarrow)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    out = apply_output_schema(df)
+    if BOARD_COLUMN in df:
+        out[BOARD_COLUMN] = df[BOARD_COLUMN].astype(object)
+    table = pa.Table.from_pandas(out, schema=_arrow_schema(list(out.columns)), preserve_index=False)
+    pq.write_table(table, path)
+
+
+def stream_jobs_to_csv(batches, output_file, parquet_file=None):
+    """Classify and write jobs page by page, holding one page in memory.
+
+    `batches` yields lists of raw jobs (see iter_job_batches). Each page is
+    appended to the CSV and, with `parquet_file`, written as a Parquet row
+    group. Summary counts are accumulated as pages go by; returns the same
+    report as analyze_jobs.
+    """
+    function_counts, level_counts, title_counts = Counter(), Counter(), Counter()
+    total_jobs = 0
+    inferred_total = 0
+    parquet_writer = None
+    if parquet_file:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = _arrow_schema()
+        parquet_writer = pq.ParquetWriter(parquet_file, schema)
     
-    return pd.DataFrame(df_data)
+    try:
+        with open(output_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=OUTPUT_COLUMNS, lineterminator="\n")
+            writer.writeheader()
+            for jobs in batches:
+                total_jobs += len(jobs)
+                jobs = project_jobs(jobs)
+                titles, functions, levels, inferred_count = classify_jobs(jobs)
+                inferred_total += inferred_count
+                function_counts.update(functions)
+                level_counts.update(levels)
+                title_counts.update(titles)
+                rows = [job_to_row(job, function, level)
+                        for job, function, level in zip(jobs, functions, levels)]
+                writer.writerows(rows)
+                if parquet_writer and rows:
+                    columns = {col: [_as_text(row[col]) for row in rows] for col in OUTPUT_COLUMNS}
+                    parquet_writer.write_table(pa.Table.from_pydict(
+                        {col: pa.array(values, pa.string()).dictionary_encode() if col in CATEGORICAL_COLUMNS
+                         else pa.array(values, pa.string()) for col, values in columns.items()},
+                        schema=schema,
+                    ))
+    finally:
+        if parquet_writer:
+            parquet_writer.close()
+    
+    print(f"\n✨ Inferred function for {inferred_total} jobs from titles")
+    return build_report(total_jobs, inferred_total, function_counts, level_counts, title_counts)
 
-if __name__ == "__main__":
-    print("Starting BVP job board scraper...")
-    print("=" * 60)
 
-    jobs = fetch_all_bvp_jobs()
+def write_changes(changes, output_file=CHANGES_OUTPUT):
+    """Write added/changed/removed JobRecords from an incremental crawl as one CSV."""
+    with open(output_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["Change"] + OUTPUT_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        for change, jobs in changes.items():
+            _, functions, levels, _ = classify_jobs(jobs)
+            for job, function, level in zip(jobs, functions, levels):
+                writer.writerow({"Change": change, **job_to_row(job, function, level)})
+    counts = ", ".join(f"{len(jobs)} {change}" for change, jobs in changes.items())
+    print(f"💾 Changes saved to: {output_file} ({counts})")
 
-    print("\n" + "=" * 60)
-    print(f"Successfully fetched {len(jobs)} jobs!")
-    print("=" * 60)
 
-    report, functions, levels, titles = analyze_jobs(jobs)
+def write_crawl_metadata(progress, complete, jobs_seen, rows, output_file=META_OUTPUT):
+    """Record how complete the crawl behind the CSV/Parquet output was.
+
+    The loader compares `jobs_seen` with the API's reported total and
+    refuses to publish a truncated crawl.
+    """
+    meta = {
+        "crawled_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "complete": complete,
+        "reported_total": progress.reported_total,
+        "jobs_seen": jobs_seen,
+        "rows": rows,
+    }
+    with open(output_file, "w") as f:
+        json.dump(meta, f, indent=2)
+    if not complete:
+        print(f"⚠️  Crawl incomplete: saw {jobs_seen} of {progress.reported_total} jobs "
+              f"(checkpoint kept, the next run resumes it)")
+
+
+def _as_text(value):
+    return None if value is None else str(value)
+
 
+def print_report(report):
     print("\n📊 ANALYSIS RESULTS")
     print("=" * 60)
     print(f"\nTotal Jobs: {report['total_jobs']}")
@@ -361,10 +800,144 @@ if __name__ == "__main__":
     for title, count in report['top_20_titles']:
         print(f"  {count:3d}x {title}")
 
-    df = create_dataframe(jobs, functions, levels)
 
-    output_file = "bvp_jobs_analysis.csv"
-    df.to_csv(output_file, index=False)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape and analyze the BVP job board")
+    parser.add_argument("--shards", help="JSON file with a list of query filters, one per concurrent shard")
+    parser.add_argument("--boards", help="JSON file listing several Getro-style boards to crawl concurrently "
+                                         "into one combined output (see load_boards)")
+    parser.add_argument("--page-size", type=int, default=MAX_PAGE_SIZE, help="jobs requested per page")
+    parser.add_argument("--workers", type=int, default=MAX_SHARD_WORKERS,
+                        help="shards crawled at once, per host with --boards "
+                             "(async backend: max concurrent requests)")
+    parser.add_argument("--backend", choices=["requests", "async"], default="requests",
+                        help="HTTP backend: threaded requests or asyncio/httpx")
+    parser.add_argument("--record", metavar="DIR",
+                        help="save raw pages to DIR for replay with fake_jobs_board.py")
+    parser.add_argument("--stream", action="store_true",
+                        help="write the CSV page by page instead of holding the whole crawl in memory")
+    parser.add_argument("--parquet", action="store_true",
+                        help=f"also write {PARQUET_OUTPUT} with a typed schema (needs pyarrow)")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"diff the crawl against the local job index and write {CHANGES_OUTPUT}")
+    parser.add_argument("--stop-after-known", type=int, metavar="N",
+                        help="with --incremental, stop paginating after N pages of unchanged jobs")
+    args = parser.parse_args()
+    if args.record and args.shards:
+        parser.error("--record only supports whole-board crawls (no --shards)")
+    if args.incremental and args.stream:
+        parser.error("--incremental cannot be combined with --stream")
+    if args.stop_after_known and not args.incremental:
+        parser.error("--stop-after-known requires --incremental")
+    if args.boards:
+        # Board tags are merged across the whole crawl, so it is collected in memory
+        conflicts = [flag for flag, used in (("--shards", args.shards), ("--record", args.record),
+                                             ("--stream", args.stream), ("--incremental", args.incremental),
+                                             ("--backend async", args.backend == "async")) if used]
+        if conflicts:
+            parser.error(f"--boards cannot be combined with {', '.join(conflicts)}")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    shards = None
+    if args.shards:
+        with open(args.shards) as f:
+            shards = json.load(f)
+    boards = None
+    if args.boards:
+        try:
+            boards = load_boards(args.boards)
+        except ValueError as e:
+            raise SystemExit(str(e))
+
+    if boards:
+        print(f"Starting job board scraper for {len(boards)} boards: {', '.join(b['name'] for b in boards)}...")
+    else:
+        print("Starting BVP job board scraper...")
+    print("=" * 60)
+
+    output_file = CSV_OUTPUT
+    parquet_file = PARQUET_OUTPUT if args.parquet else None
+    title_caches = [attach_cache(FUNCTION_CLASSIFIER, "function"), attach_cache(LEVEL_CLASSIFIER, "level")]
+    # Checkpoints every page; an interrupted crawl resumes on the next run
+    progress = CrawlProgress(shards, SEARCH_JOBS_URL, boards=boards)
+
+    if args.stream:
+        # Fetch, classify and write one page at a time
+        with RUN_REPORT.stage("stream"):
+            pages = iter_pages(shards, args.page_size, args.workers, args.backend, progress)
+            batches = iter_job_batches(pages, dedupe=bool(shards and len(shards) > 1), record_dir=args.record)
+            report = stream_jobs_to_csv(batches, output_file, parquet_file)
+        df = None
+        crawl_complete, jobs_seen = progress.complete, progress.fetched
+    elif args.incremental:
+        from job_index import open_job_index
+        index = open_job_index()
+        if index is None:
+            raise SystemExit("--incremental needs the job index (JOB_INDEX_PATH is empty)")
+        with RUN_REPORT.stage("crawl"):
+            pages = iter_pages(shards, args.page_size, args.workers, args.backend, progress)
+            batches = iter_job_batches(pages, dedupe=bool(shards and len(shards) > 1), record_dir=args.record)
+            # Pages are diffed and projected as they arrive
+            jobs, reached_end = index.crawl(batches, args.stop_after_known)
+            # Stops the fetchers and waits for them, so no page is checkpointed after
+            # this point and progress.discard() below cannot race a save
+            pages.close()
+        with RUN_REPORT.stage("diff"):
+            # A crawl that gave up part way must not be read as removals either
+            jobs, changes = index.finish(jobs, complete=reached_end and progress.complete)
+            index.close()
+            if not reached_end:
+                # Deliberate early stop: the index filled in the rest, nothing to resume
+                progress.discard()
+            elif not progress.complete:
+                print("  Crawl incomplete: unreached jobs carried over from the index, removals not checked")
+            write_changes(changes)
+        crawl_complete = progress.complete or not reached_end
+        jobs_seen = progress.fetched if reached_end else len(jobs)
+    elif boards:
+        with RUN_REPORT.stage("crawl"):
+            jobs = fetch_all_board_jobs(boards, args.page_size, args.workers, progress)
+        crawl_complete, jobs_seen = progress.complete, progress.fetched
+    else:
+        with RUN_REPORT.stage("crawl"):
+            jobs = fetch_all_bvp_jobs(shards, args.page_size, args.workers, args.backend, args.record, progress)
+        crawl_complete, jobs_seen = progress.complete, progress.fetched
+
+    if not args.stream:
+        print("\n" + "=" * 60)
+        print(f"Successfully fetched {len(jobs)} jobs!")
+        print("=" * 60)
+
+        with RUN_REPORT.stage("classify"):
+            report, functions, levels, titles = analyze_jobs(jobs)
+            df = create_dataframe(jobs, functions, levels)
+            if boards:
+                df[BOARD_COLUMN] = [", ".join(job.boards) for job in jobs]
+
+    for cache in title_caches:
+        if cache:
+            cache.save()
+
+    print_report(report)
+
+    with RUN_REPORT.stage("write"):
+        if df is not None:
+            df.to_csv(output_file, index=False)
+            if parquet_file:
+                write_parquet(df, parquet_file)
     print(f"\n💾 Data saved to: {output_file}")
+    if parquet_file:
+        print(f"💾 Parquet saved to: {parquet_file}")
+
+    rows = len(df) if df is not None else report["total_jobs"]
+    write_crawl_metadata(progress, crawl_complete, jobs_seen, rows)
+    progress.finish()
+
+    RUN_REPORT.info.update(backend=args.backend, shards=len(progress.shards), boards=len(boards or [None]), rows=rows,
+                           reported_total=progress.reported_total, crawl_complete=crawl_complete)
+    RUN_REPORT.write(SCRAPE_REPORT_OUTPUT, "bvp_jobs_analyzer.py")
 
     print("\n✅ Analysis complete!")
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+# Where interrupted crawls are saved; set CRAWL_CHECKPOINT_DIR='' to disable
+CRAWL_CHECKPOINT_DIR = os.environ.get("CRAWL_CHECKPOINT_DIR", ".cache/crawl")
+
+# Checkpoints older than this are thrown away instead of resumed
+CHECKPOINT_MAX_AGE_HOURS = 12
+
+
+def shard_label(i, query, board=None):
+    """Progress label for shard `i`, prefixed with its board's name in multi-board crawls."""
+    label = "all" if query is None else f"shard {i + 1}"
+    if board is None:
+        return label
+    return board if query is None else f"{board} {label}"
+
+
+class ShardCheckpoint:
+    """How far one shard's crawl got: sequence token, pages and totals.
+
+    With a `directory`, every page is saved there as it arrives together
+    with a state file, so an interrupted crawl replays those pages and
+    continues from the saved sequence token instead of starting over.
+    """
+
+    def __init__(self, label, directory=None):
+        self.label = label
+        self.directory = directory
+        self._reset()
+        if directory:
+            self._load()
+
+    def _reset(self):
+        self.sequence = None
+        self.page_size = None
+        self.pages = 0
+        self.fetched = 0
+        self.total = None
+        self.complete = False
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.directory, "state.json")) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if time.time() - state.get("saved_at", 0) > CHECKPOINT_MAX_AGE_HOURS * 3600:
+            print(f"  [{self.label}] Discarding checkpoint older than {CHECKPOINT_MAX_AGE_HOURS}h")
+            self.clear()
+            return
+        missing = self._missing_page(state.get("pages", 0))
+        if missing:
+            print(f"  [{self.label}] Discarding checkpoint with missing page {missing}")
+            self.clear()
+            return
+        for name in ("sequence", "page_size", "pages", "fetched", "total", "complete"):
+            setattr(self, name, state[name])
+
+    def _page_path(self, n):
+        return os.path.join(self.directory, f"page_{n:04d}.json")
+
+    def _missing_page(self, pages):
+        """Number of the first of pages 1..`pages` without a file, or None."""
+        for n in range(1, pages + 1):
+            if not os.path.exists(self._page_path(n)):
+                return n
+        return None
+
+    def replay(self):
+        """Yield the pages saved by an earlier, interrupted run.
+
+        If a page has gone missing since the checkpoint was loaded, the
+        checkpoint is invalid: it is cleared and nothing is replayed, so the
+        shard is crawled from the start.
+        """
+        missing = self._missing_page(self.pages)
+        if missing:
+            print(f"  [{self.label}] Checkpoint page {missing} is missing, restarting from the first page")
+            self.clear()
+            self._reset()
+            return
+        for n in range(1, self.pages + 1):
+            with open(self._page_path(n)) as f:
+                yield json.load(f)
+
+    def save(self, data, sequence, fetched, page_size):
+        """Record one fetched page; `sequence` is the next token (None when done)."""
+        self.pages += 1
+        self.fetched = fetched
+        self.total = data.get("total", self.total)
+        self.sequence = sequence
+        self.page_size = page_size
+        self.complete = sequence is None
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._page_path(self.pages), "w") as f:
+            json.dump(data, f)
+        # State is replaced atomically so a crash never leaves it half-written
+        state = {name: getattr(self, name)
+                 for name in ("sequence", "page_size", "pages", "fetched", "total", "complete")}
+        tmp = os.path.join(self.directory, "state.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({**state, "saved_at": time.time()}, f)
+        os.replace(tmp, os.path.join(self.directory, "state.json"))
+
+    def clear(self):
+        if self.directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class CrawlProgress:
+    """Checkpoints for every shard of one crawl, in shard order.
+
+    With `boards` (see bvp_jobs_analyzer.load_boards) the crawl covers every
+    shard of every board, board by board, and `shards`/`url` are ignored.
+    """
+
+    def __init__(self, shards=None, url="", directory=None, boards=None):
+        directory = CRAWL_CHECKPOINT_DIR if directory is None else directory
+        self.shards = []
+        if boards is None:
+            units = [(shard_label(i, query), [url, query]) for i, query in enumerate(shards or [None])]
+        else:
+            units = [(shard_label(i, query, board["name"]), [board["url"], board["id"], query])
+                     for board in boards for i, query in enumerate(board["shards"])]
+        for label, identity in units:
+            key = hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:16]
+            self.shards.append(ShardCheckpoint(label, os.path.join(directory, key) if directory else None))
+
+    @property
+    def complete(self):
+        return all(shard.complete for shard in self.shards)
+
+    @property
+    def fetched(self):
+        return sum(shard.fetched for shard in self.shards)
+
+    @property
+    def reported_total(self):
+        totals = [shard.total for shard in self.shards]
+        return None if None in totals else sum(totals)
+
+    def finish(self):
+        """Drop the checkpoints once every shard has been crawled to the end."""
+        if self.complete:
+            self.discard()
+
+    def discard(self):
+        for shard in self.shards:
+            shard.clear()
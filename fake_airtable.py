@@ -0,0 +1,331 @@
+"""Local stand-in for an Airtable base, for offline benchmarking.
+
+FakeAirtable keeps the base in memory and implements the slice of
+pyairtable's Api/Table interface the loader uses (`api.table()`,
+`batch_create`, `batch_update`, `batch_upsert`, `batch_delete`, `create`
+and paged reads through `table.api.get`). It enforces Airtable's limits: at
+most 10 records per write request (422 otherwise) and 5 requests per second
+per base (429 otherwise). Errors are raised as requests.HTTPError, like
+pyairtable does.
+
+Run as a script, it serves the same base over the Airtable REST API, so the
+unmodified loader can be pointed at it:
+
+    python fake_airtable.py --latency 0.1
+    AIRTABLE_TOKEN=fake AIRTABLE_ENDPOINT_URL=http://127.0.0.1:8766 python load_jobs_to_airtable.py
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import requests
+
+from airtable_writer import AIRTABLE_BATCH_SIZE, AIRTABLE_RATE_LIMIT
+
+PAGE_SIZE_LIMIT = 100
+DEFAULT_PORT = 8766
+
+
+def http_error(status, error_type, message):
+    """requests.HTTPError carrying an Airtable-style error body."""
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps({'error': {'type': error_type, 'message': message}}).encode()
+    return requests.HTTPError(f"{status} Client Error: {error_type}: {message}", response=response)
+
+
+class FakeAirtable:
+    """One in-memory base: tables of records plus per-base request accounting.
+
+    The rate limit is a token bucket holding one second's worth of requests,
+    so a client pacing itself at `rate` never trips it but a burst does.
+    `latency` seconds are added to every request.
+    """
+
+    def __init__(self, rate=AIRTABLE_RATE_LIMIT, batch_size=AIRTABLE_BATCH_SIZE, latency=0.0):
+        self.rate = rate
+        self.batch_size = batch_size
+        self.latency = latency
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.tables = {}
+        self.ids = itertools.count(1)
+        self.stats = Counter()
+
+    def table(self, base_id, table_id):
+        return FakeTable(self, table_id)
+
+    def records(self, table_id):
+        """Current records of a table, in creation order."""
+        return list(self.tables.get(table_id, {}).values())
+
+    def record_counts(self):
+        with self.lock:
+            return {table_id: len(table) for table_id, table in self.tables.items()}
+
+    # ── Limits ───────────────────────────────────────────────
+
+    def _request(self, kind, records=None):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.stats['requests'] += 1
+            now = time.monotonic()
+            self.tokens = min(float(self.rate), self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                self.stats['rate_limited'] += 1
+                raise http_error(429, 'RATE_LIMIT_REACHED', f'more than {self.rate} requests per second')
+            self.tokens -= 1
+            if records is not None and len(records) > self.batch_size:
+                self.stats['rejected'] += 1
+                raise http_error(422, 'INVALID_RECORDS', f'more than {self.batch_size} records')
+            self.stats[kind] += 1
+            if records is not None:
+                self.stats[f'{kind}_records'] += len(records)
+
+    # ── Operations ───────────────────────────────────────────
+
+    def get(self, url, params=None):
+        """Paged list request, as issued through `table.api.get`."""
+        self._request('list')
+        params = params or {}
+        size = min(int(params.get('pageSize', PAGE_SIZE_LIMIT)), PAGE_SIZE_LIMIT)
+        offset = int(params.get('offset') or 0)
+        with self.lock:
+            records = self.records(url)
+        page = {'records': [dict(r, fields=dict(r['fields'])) for r in records[offset:offset + size]]}
+        if offset + size < len(records):
+            page['offset'] = str(offset + size)
+        return page
+
+    def fetch(self, table_id, record_id):
+        self._request('get')
+        with self.lock:
+            record = self.tables.get(table_id, {}).get(record_id)
+            if record is None:
+                raise http_error(404, 'NOT_FOUND', f'record {record_id} does not exist')
+            return dict(record, fields=dict(record['fields']))
+
+    def create(self, table_id, field_dicts):
+        self._request('create', field_dicts)
+        with self.lock:
+            return [self._insert(table_id, fields) for fields in field_dicts]
+
+    def update(self, table_id, updates, replace=False):
+        self._request('update', updates)
+        with self.lock:
+            table = self.tables.setdefault(table_id, {})
+            missing = [u['id'] for u in updates if u['id'] not in table]
+            if missing:
+                raise http_error(404, 'NOT_FOUND', f'record {missing[0]} does not exist')
+            return [self._patch(table[u['id']], u['fields'], replace) for u in updates]
+
+    def upsert(self, table_id, records, key_fields, replace=False):
+        """Update records matching on `key_fields` (or id), create the rest."""
+        self._request('upsert', records)
+        result = {'records': [], 'createdRecords': [], 'updatedRecords': []}
+        with self.lock:
+            table = self.tables.setdefault(table_id, {})
+            index = {}
+            for r in table.values():
+                index.setdefault(_merge_key(r['fields'], key_fields), []).append(r)
+            for record in records:
+                fields = record.get('fields', {})
+                if 'id' in record:
+                    matches = [table[record['id']]] if record['id'] in table else []
+                else:
+                    matches = index.get(_merge_key(fields, key_fields), [])
+                if len(matches) > 1:
+                    raise http_error(422, 'INVALID_VALUE_FOR_COLUMN',
+                                     f'{len(matches)} records match {key_fields}')
+                if matches:
+                    saved = self._patch(matches[0], fields, replace)
+                    result['updatedRecords'].append(saved['id'])
+                else:
+                    saved = self._insert(table_id, fields)
+                    index[_merge_key(fields, key_fields)] = [saved]
+                    result['createdRecords'].append(saved['id'])
+                result['records'].append(saved)
+        return result
+
+    def delete(self, table_id, record_ids):
+        self._request('delete', record_ids)
+        with self.lock:
+            table = self.tables.setdefault(table_id, {})
+            return [{'id': rid, 'deleted': table.pop(rid, None) is not None} for rid in record_ids]
+
+    def _insert(self, table_id, fields):
+        record = {'id': f'rec{next(self.ids):014d}', 'createdTime': _now(), 'fields': _stored(fields)}
+        self.tables.setdefault(table_id, {})[record['id']] = record
+        return record
+
+    def _patch(self, record, fields, replace):
+        # PATCH merges the given fields (None/'' clears one); PUT replaces them all
+        record['fields'] = _stored(fields if replace else {**record['fields'], **fields})
+        return record
+
+
+class FakeTable:
+    """pyairtable.Table look-alike bound to one table of a FakeAirtable."""
+
+    def __init__(self, base, table_id):
+        self.base = base
+        self.api = base
+        self.table_id = table_id
+        self.urls = SimpleNamespace(records=table_id)
+
+    def batch_create(self, records):
+        return self.base.create(self.table_id, list(records))
+
+    def batch_update(self, records, replace=False):
+        return self.base.update(self.table_id, list(records), replace)
+
+    def batch_upsert(self, records, key_fields, replace=False):
+        return self.base.upsert(self.table_id, list(records), key_fields, replace)
+
+    def batch_delete(self, record_ids):
+        return self.base.delete(self.table_id, list(record_ids))
+
+    def create(self, fields):
+        return self.base.create(self.table_id, [fields])[0]
+
+    def all(self):
+        return self.base.records(self.table_id)
+
+
+def _stored(fields):
+    """Airtable drops empty values instead of storing them."""
+    return {name: value for name, value in fields.items()
+            if value is not None and not (isinstance(value, (str, list)) and not value)}
+
+
+def _merge_key(fields, key_fields):
+    # An empty value matches a field that was never stored
+    values = [fields.get(name) for name in key_fields]
+    return json.dumps(['' if value is None else value for value in values], default=str)
+
+
+def _now():
+    return time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
+
+
+# ── REST server ─────────────────────────────────────────────
+
+def make_handler(base):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def send_json(self, status, body):
+            data = body if isinstance(body, bytes) else json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def handle_request(self, method):
+            url = urlsplit(self.path)
+            query = parse_qs(url.query)
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            # /v0/{base}/{table}[/{record id} | /listRecords]
+            parts = [unquote(p) for p in url.path.strip("/").split("/")]
+            if len(parts) not in (3, 4) or parts[0] != "v0":
+                self.send_json(404, {"error": {"type": "NOT_FOUND", "message": self.path}})
+                return
+            table, record_id = parts[2], parts[3] if len(parts) == 4 else None
+            try:
+                self.send_json(200, route(base, method, table, record_id, query, body))
+            except requests.HTTPError as e:
+                self.send_json(e.response.status_code, e.response.content)
+
+        def do_GET(self):
+            self.handle_request("GET")
+
+        def do_POST(self):
+            self.handle_request("POST")
+
+        def do_PATCH(self):
+            self.handle_request("PATCH")
+
+        def do_PUT(self):
+            self.handle_request("PUT")
+
+        def do_DELETE(self):
+            self.handle_request("DELETE")
+
+    return Handler
+
+
+def route(base, method, table, record_id, query, body):
+    """Dispatch one REST call to the base; returns the JSON response body."""
+    if method == "GET":
+        if record_id is not None:
+            return base.fetch(table, record_id)
+        return base.get(table, {name: values[-1] for name, values in query.items()})
+    if method == "POST" and record_id == "listRecords":
+        return base.get(table, body)
+    if method == "POST" and record_id is None:
+        if "records" in body:
+            return {"records": base.create(table, [r.get("fields", {}) for r in body["records"]])}
+        return base.create(table, [body.get("fields", {})])[0]
+    if method in ("PATCH", "PUT"):
+        replace = method == "PUT"
+        if record_id is not None:
+            return base.update(table, [{"id": record_id, "fields": body.get("fields", {})}], replace)[0]
+        upsert = body.get("performUpsert")
+        if upsert:
+            return base.upsert(table, body.get("records", []), upsert.get("fieldsToMergeOn", []), replace)
+        return {"records": base.update(table, body.get("records", []), replace)}
+    if method == "DELETE":
+        ids = [record_id] if record_id else query.get("records[]", [])
+        deleted = base.delete(table, ids)
+        return deleted[0] if record_id else {"records": deleted}
+    raise http_error(404, "NOT_FOUND", f"{method} {table}/{record_id or ''}")
+
+
+def start_server(base=None, port=DEFAULT_PORT, host="127.0.0.1"):
+    """Serve `base` on a background thread; returns (server, endpoint url)."""
+    base = base or FakeAirtable()
+    server = ThreadingHTTPServer((host, port), make_handler(base))
+    server.daemon_threads = True
+    server.base = base
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Airtable REST API stand-in")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--rate", type=float, default=AIRTABLE_RATE_LIMIT,
+                        help="requests/second per base before answering 429")
+    parser.add_argument("--batch-size", type=int, default=AIRTABLE_BATCH_SIZE,
+                        help="records per write request before answering 422")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    args = parser.parse_args()
+
+    base = FakeAirtable(args.rate, args.batch_size, args.latency)
+    server, url = start_server(base, args.port)
+    print(f"Fake Airtable listening on {url} (set AIRTABLE_ENDPOINT_URL={url})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"\nServed: {dict(base.stats)}")
+        print(f"Records: {base.record_counts()}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
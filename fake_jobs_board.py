@@ -0,0 +1,229 @@
+"""Local stand-in for jobs.bvp.com's search-jobs API, for offline benchmarking.
+
+Replays pages recorded with `bvp_jobs_analyzer.py --record DIR`, or serves a
+synthetic board of N jobs. Latency, server errors and rate limiting can be
+injected to exercise the scraper's retry and concurrency behaviour.
+
+    python fake_jobs_board.py --replay recorded/ --latency 0.2 --error-rate 0.05
+    BVP_JOBS_URL=http://127.0.0.1:8765/api-boards/search-jobs python bvp_jobs_analyzer.py
+"""
+import argparse
+import glob
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SEARCH_JOBS_PATH = "/api-boards/search-jobs"
+DEFAULT_PORT = 8765
+
+SYNTHETIC_TITLES = [
+    ("Account Executive", 40), ("Senior Software Engineer", 35), ("Software Engineer", 30),
+    ("Staff Software Engineer", 12), ("Product Manager", 10), ("Senior Product Manager", 8),
+    ("Customer Success Manager", 12), ("Sales Development Representative", 14),
+    ("Data Scientist", 6), ("Data Engineer", 6), ("Product Designer", 5),
+    ("Recruiter", 5), ("Marketing Manager", 5), ("Solutions Architect", 6),
+    ("Engineering Manager", 6), ("Director of Finance", 2), ("Head of People", 2),
+    ("VP of Sales", 2), ("Office Manager", 2), ("Executive Assistant", 2),
+    ("Senior Accountant", 3), ("Legal Counsel", 2), ("IT Support Specialist", 2),
+    ("Chief of Staff", 1), ("Registered Nurse", 3), ("Barista", 1), ("Field Technician", 3),
+    # Postings the loader filters out
+    ("소프트웨어 엔지니어", 1), ("サーバーサイドエンジニア", 1), ("[TEST] Software Engineer", 0.3),
+]
+SYNTHETIC_TEAMS = ["Platform", "EMEA", "Enterprise", "Growth", "Payments", "Mid-Market",
+                   "Infrastructure", "Security", "AI", "Public Sector", "Partnerships", "Mobile"]
+SYNTHETIC_DEPARTMENTS = ["Engineering", "Sales", "Go-To-Market", "Customer Experience",
+                         "Product Management", "People", "G&A", "R&D",
+                         # Not in MAPPING, so the loader infers these from the title
+                         "Special Projects", "Team 42"]
+SYNTHETIC_LOCATIONS = ["New York, NY, USA", "San Francisco, CA, USA", "London, UK",
+                       "Tel Aviv, Israel", "Remote", "Austin, TX, USA", "Bengaluru, India"]
+# A few real portfolio names (one excluded by the loader) ahead of generated ones
+SYNTHETIC_COMPANIES = ["Canva", "Ramp", "Waymo", "Anthropic", "Discord", "Toss"]
+
+
+def synthetic_jobs(n, seed=0, companies=350, descriptions=True):
+    """Generate `n` search-jobs job dicts with a realistic title mix.
+
+    Titles are drawn from a weighted list and sometimes qualified with a
+    team or region, so there are a few thousand distinct titles with a long
+    tail, and company sizes are skewed, as on the real board.
+    `descriptions=False` leaves out the bulky description text (e.g. for
+    large in-memory fixtures).
+    """
+    rng = random.Random(seed)
+    titles = [t for t, _ in SYNTHETIC_TITLES]
+    weights = [w for _, w in SYNTHETIC_TITLES]
+    names = (SYNTHETIC_COMPANIES + [f"Company {i:03d}" for i in range(companies)])[:companies]
+    # Zipf-like company sizes: a few big hirers, a long tail of small ones
+    sizes = list(itertools.accumulate((rank + 1) ** -0.7 for rank in range(len(names))))
+    jobs = []
+    for i in range(n):
+        title = rng.choices(titles, weights)[0]
+        if rng.random() < 0.35:
+            title = f"{title}, {rng.choice(SYNTHETIC_TEAMS)}"
+        location = rng.choice(SYNTHETIC_LOCATIONS)
+        if rng.random() < 0.15:
+            title = f"{title} ({location.split(',')[0]})"
+        remote = location == "Remote"
+        job = {
+            "id": f"job-{seed}-{i}",
+            "title": title,
+            "companyName": rng.choices(names, cum_weights=sizes)[0],
+            "departments": [rng.choice(SYNTHETIC_DEPARTMENTS)] if rng.random() < 0.6 else [],
+            "locations": [location],
+            "normalizedLocations": [{"label": location, "value": location.lower()}],
+            "url": f"https://jobs.example.com/company/job-{seed}-{i}",
+            "remote": remote,
+            "hybrid": not remote and rng.random() < 0.2,
+            "createdAt": 1700000000 + i,
+        }
+        if descriptions:
+            job["description"] = "Lorem ipsum " * rng.randint(20, 80)
+        jobs.append(job)
+    return jobs
+
+
+class JobsBoard:
+    """Serves pages either from a recording or from an in-memory job list."""
+
+    def __init__(self, jobs=None, recorded=None, max_page_size=100):
+        self.jobs = jobs or []
+        self.max_page_size = max_page_size
+        # Recorded pages chain through meta.sequence: key '' is the first page
+        self.recorded = {}
+        previous = ""
+        for page in recorded or []:
+            self.recorded[previous] = page
+            previous = page.get("meta", {}).get("sequence", "")
+
+    @classmethod
+    def from_recording(cls, directory):
+        pages = []
+        for path in sorted(glob.glob(os.path.join(directory, "page_*.json"))):
+            with open(path) as f:
+                pages.append(json.load(f))
+        return cls(recorded=pages)
+
+    def page(self, payload):
+        sequence = payload.get("meta", {}).get("sequence") or ""
+        if self.recorded:
+            return self.recorded.get(sequence, {"jobs": [], "total": 0, "meta": {}})
+        size = min(int(payload.get("meta", {}).get("size", 20)), self.max_page_size)
+        offset = int(sequence or 0)
+        return {
+            "jobs": self.jobs[offset:offset + size],
+            "total": len(self.jobs),
+            "meta": {"size": size, "sequence": str(offset + size)},
+        }
+
+
+class FaultInjector:
+    """Latency, random 5xx errors and a requests-per-second ceiling (429s)."""
+
+    def __init__(self, latency=0.0, error_rate=0.0, rate_limit=None, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.window = []
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "bytes": 0}
+
+    def check(self):
+        """Return an HTTP error status to inject, or None to serve normally."""
+        with self.lock:
+            self.stats["requests"] += 1
+            now = time.monotonic()
+            if self.rate_limit:
+                self.window = [t for t in self.window if now - t < 1.0]
+                if len(self.window) >= self.rate_limit:
+                    self.stats["rate_limited"] += 1
+                    return 429
+                self.window.append(now)
+            if self.error_rate and self.rng.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return self.rng.choice((500, 502))
+        return None
+
+
+def make_handler(board, faults):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def send_json(self, status, body, headers=()):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+            with faults.lock:
+                faults.stats["bytes"] += len(data)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if self.path.split("?")[0] != SEARCH_JOBS_PATH:
+                self.send_json(404, {"error": "not found"})
+                return
+            if faults.latency:
+                time.sleep(faults.latency)
+            status = faults.check()
+            if status == 429:
+                self.send_json(429, {"error": "rate limited"}, [("Retry-After", "1")])
+            elif status:
+                self.send_json(status, {"error": "injected failure"})
+            else:
+                self.send_json(200, board.page(payload))
+
+    return Handler
+
+
+def start_server(board, faults=None, port=DEFAULT_PORT, host="127.0.0.1"):
+    """Start the fake board on a background thread; returns (server, url)."""
+    faults = faults or FaultInjector()
+    server = ThreadingHTTPServer((host, port), make_handler(board, faults))
+    server.daemon_threads = True
+    server.faults = faults
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}{SEARCH_JOBS_PATH}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake jobs.bvp.com search-jobs server")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--replay", metavar="DIR", help="directory of recorded page_*.json files")
+    source.add_argument("--synthetic", type=int, metavar="N", help="serve N generated jobs")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-page-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 5xx")
+    parser.add_argument("--rate-limit", type=float, help="requests/second before answering 429")
+    args = parser.parse_args()
+
+    if args.replay:
+        board = JobsBoard.from_recording(args.replay)
+    else:
+        board = JobsBoard(jobs=synthetic_jobs(args.synthetic), max_page_size=args.max_page_size)
+    faults = FaultInjector(args.latency, args.error_rate, args.rate_limit)
+    server, url = start_server(board, faults, args.port)
+    print(f"Fake jobs board listening on {url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"\nServed: {faults.stats}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import os
+import sqlite3
+
+# Local snapshot history; set JOBS_HISTORY_PATH='' to disable it
+JOBS_HISTORY_PATH = os.environ.get('JOBS_HISTORY_PATH', '.cache/jobs_history.sqlite')
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS snapshots ('
+    'snapshot_date TEXT PRIMARY KEY, total_jobs INTEGER, companies INTEGER)',
+    'CREATE TABLE IF NOT EXISTS company_counts ('
+    'snapshot_date TEXT, company TEXT, jobs INTEGER, PRIMARY KEY (snapshot_date, company))',
+    'CREATE TABLE IF NOT EXISTS function_counts ('
+    'snapshot_date TEXT, function TEXT, jobs INTEGER, PRIMARY KEY (snapshot_date, function))',
+    'CREATE TABLE IF NOT EXISTS jobs ('
+    'snapshot_date TEXT, url TEXT, company TEXT, title TEXT, function TEXT, level TEXT)',
+    'CREATE INDEX IF NOT EXISTS jobs_by_date ON jobs (snapshot_date)',
+    'CREATE TABLE IF NOT EXISTS stage_digests (stage TEXT PRIMARY KEY, digest TEXT)',
+)
+
+
+class HistoryStore:
+    """Per-snapshot company, function and job counts, kept in SQLite.
+
+    Each loader run records one snapshot keyed by its date; re-running on
+    the same date replaces that snapshot, older ones are never touched.
+    Velocity is read from here instead of from Airtable. The store also
+    remembers a content hash of what each pipeline stage last wrote.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+
+    def previous_snapshot(self, before):
+        """Date of the latest snapshot strictly before `before`, or None."""
+        row = self.conn.execute(
+            'SELECT MAX(snapshot_date) FROM snapshots WHERE snapshot_date < ?', (before,)
+        ).fetchone()
+        return row[0]
+
+    def snapshot_totals(self, snapshot_date):
+        row = self.conn.execute(
+            'SELECT total_jobs, companies FROM snapshots WHERE snapshot_date = ?', (snapshot_date,)
+        ).fetchone()
+        return {'total': row[0], 'companies': row[1]} if row else None
+
+    def company_totals(self, snapshot_date):
+        """Company → job count for every company in a snapshot."""
+        return dict(self.conn.execute(
+            'SELECT company, jobs FROM company_counts WHERE snapshot_date = ?', (snapshot_date,)
+        ))
+
+    def function_totals(self, snapshot_date):
+        return dict(self.conn.execute(
+            'SELECT function, jobs FROM function_counts WHERE snapshot_date = ?', (snapshot_date,)
+        ))
+
+    def record(self, snapshot_date, df, metrics):
+        """Store this run's jobs and aggregates as the `snapshot_date` snapshot."""
+        companies = metrics['companies']['total']
+        functions = metrics['functions']['total']
+        jobs = df[['URL', 'Company', 'Title', 'Fixed', 'Level']].astype(object)
+        jobs = jobs.where(jobs.notna(), None)
+
+        with self.conn:
+            for table in ('snapshots', 'company_counts', 'function_counts', 'jobs'):
+                self.conn.execute(f'DELETE FROM {table} WHERE snapshot_date = ?', (snapshot_date,))
+            self.conn.execute(
+                'INSERT INTO snapshots VALUES (?, ?, ?)',
+                (snapshot_date, metrics['snapshot']['total'], metrics['snapshot']['companies']),
+            )
+            self.conn.executemany(
+                'INSERT INTO company_counts VALUES (?, ?, ?)',
+                [(snapshot_date, str(name), int(n)) for name, n in companies.items()],
+            )
+            self.conn.executemany(
+                'INSERT INTO function_counts VALUES (?, ?, ?)',
+                [(snapshot_date, str(name), int(n)) for name, n in functions.items()],
+            )
+            self.conn.executemany(
+                'INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?)',
+                ((snapshot_date, *row) for row in jobs.itertuples(index=False)),
+            )
+        print(f"  History: recorded snapshot {snapshot_date} "
+              f"({len(jobs)} jobs, {len(companies)} companies)")
+
+    def stage_digest(self, stage):
+        row = self.conn.execute(
+            'SELECT digest FROM stage_digests WHERE stage = ?', (stage,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def save_stage_digest(self, stage, digest):
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO stage_digests VALUES (?, ?)', (stage, digest))
+
+    def close(self):
+        self.conn.close()
+
+
+def open_history(path=None):
+    """Open the history store, or return None when it is disabled."""
+    path = JOBS_HISTORY_PATH if path is None else path
+    if not path:
+        return None
+    return HistoryStore(path)
@@ -0,0 +1,334 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import zlib
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+# Fingerprints of postings seen in earlier runs; set JOB_FINGERPRINTS_PATH='' to disable
+JOB_FINGERPRINTS_PATH = os.environ.get('JOB_FINGERPRINTS_PATH', '.cache/job_fingerprints.sqlite')
+
+# Fingerprints not seen for this long are forgotten
+FINGERPRINT_RETENTION_DAYS = 180
+
+# MinHash/LSH: 16 bands of 4 rows catch title pairs above the threshold
+# with >99.9% probability while rarely pairing unrelated titles
+NUM_PERM = 64
+LSH_BANDS = 16
+NEAR_DUPLICATE_THRESHOLD = 0.85
+SHINGLE_SIZE = 3
+
+# Spellings folded together before titles are compared
+TITLE_ABBREVIATIONS = {
+    'sr': 'senior',
+    'snr': 'senior',
+    'jr': 'junior',
+    'mgr': 'manager',
+    'assoc': 'associate',
+}
+# Work-arrangement words some boards append to titles
+TITLE_FILLER = {'remote', 'hybrid', 'onsite'}
+
+WORD_RE = re.compile(r'\w+')
+# Near-duplicate titles are spelling variants: same number of words and the
+# same level markers ("II", "3"), so "Engineer, AI" or "Engineer III" stay apart
+TITLE_MARKER_RE = re.compile(r'\b(?:\d+|i{1,3}|iv|vi{0,3}|ix|x)\b')
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = np.random.default_rng(1)
+_PERM_A = _rng.integers(1, 1 << 31, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 31, NUM_PERM, dtype=np.uint64)
+_BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def normalize_text(value):
+    """Casefolded words separated by single spaces ('' for missing values)."""
+    if not isinstance(value, str):
+        return ''
+    return ' '.join(WORD_RE.findall(value.casefold()))
+
+
+def normalize_title(value):
+    """normalize_text plus common abbreviations expanded and filler words dropped."""
+    words = (TITLE_ABBREVIATIONS.get(w, w) for w in normalize_text(value).split())
+    return ' '.join(w for w in words if w not in TITLE_FILLER)
+
+
+def _normalized(values, fn):
+    """Apply `fn` once per distinct value and broadcast back to a numpy array."""
+    codes, uniques = pd.factorize(values)
+    found = np.array([fn(v) for v in uniques] + [fn(None)], dtype=object)
+    return found[codes]
+
+
+def fingerprint(company, title, location):
+    """Stable hash of one normalized (company, title, location) key."""
+    return hashlib.sha1(json.dumps([company, title, location]).encode()).hexdigest()[:16]
+
+
+# ── MinHash / LSH ───────────────────────────────────────────
+
+def shingles(title):
+    """Character n-grams of a normalized title, padded so short words still count."""
+    padded = f' {title} '
+    return {padded[i:i + SHINGLE_SIZE] for i in range(max(1, len(padded) - SHINGLE_SIZE + 1))}
+
+
+def minhash_signatures(titles, chunk=2048):
+    """NUM_PERM-wide MinHash signature per title, as a (len(titles), NUM_PERM) array."""
+    signatures = np.empty((len(titles), NUM_PERM), dtype=np.uint64)
+    for start in range(0, len(titles), chunk):
+        sets = [shingles(t) for t in titles[start:start + chunk]]
+        sizes = np.array([len(s) for s in sets])
+        hashed = np.fromiter((zlib.crc32(g.encode()) for s in sets for g in s),
+                             dtype=np.uint64, count=int(sizes.sum()))
+        permuted = (_PERM_A[:, None] * hashed + _PERM_B[:, None]) % _MERSENNE_PRIME
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        signatures[start:start + len(sets)] = np.minimum.reduceat(permuted, offsets, axis=1).T
+    return signatures
+
+
+def lsh_candidates(signatures, blocks):
+    """Candidate (i, j) index pairs, i < j: items of one block sharing an LSH band.
+
+    Each item is paired with the first item of every bucket it falls in,
+    which keeps the work linear in the number of items.
+    """
+    rows = NUM_PERM // LSH_BANDS
+    block_codes = pd.factorize(blocks)[0].astype(np.uint64)
+    pairs = []
+    for band in range(LSH_BANDS):
+        key = block_codes.copy()
+        for col in signatures[:, band * rows:(band + 1) * rows].T:
+            key = key * _BAND_MULTIPLIER ^ col
+        order = np.argsort(key, kind='stable')
+        sorted_keys = key[order]
+        run_start = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        firsts = order[np.repeat(run_start, np.diff(np.r_[run_start, len(order)]))]
+        paired = firsts != order
+        pairs.append(np.stack([firsts[paired], order[paired]], axis=1))
+    pairs = np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int64)
+    # Band hashes can collide across blocks; those pairs are dropped here
+    pairs = pairs[block_codes[pairs[:, 0]] == block_codes[pairs[:, 1]]]
+    n = len(signatures)
+    flat = np.unique(pairs[:, 0] * n + pairs[:, 1])
+    return np.stack([flat // n, flat % n], axis=1)
+
+
+def is_near_duplicate(a, b):
+    """True when two normalized titles are spelling variants of each other."""
+    if a == b:
+        return True
+    if a.count(' ') != b.count(' ') or TITLE_MARKER_RE.findall(a) != TITLE_MARKER_RE.findall(b):
+        return False
+    sa, sb = shingles(a), shingles(b)
+    return len(sa & sb) / len(sa | sb) >= NEAR_DUPLICATE_THRESHOLD
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _union(parent, i, j):
+    i, j = _find(parent, i), _find(parent, j)
+    if i != j:
+        # The lower index (earlier posting) stays the root
+        parent[max(i, j)] = min(i, j)
+
+
+# ── Dedup stage ─────────────────────────────────────────────
+
+def dedupe_jobs(df, store=None):
+    """Drop repeated postings, keeping the first row of each.
+
+    Rows are grouped by a hashed index of normalized (company, title,
+    location) keys, and rows sharing a URL are merged. Groups in the same
+    company and location whose titles are near-identical (MinHash/LSH
+    candidates verified against NEAR_DUPLICATE_THRESHOLD) are merged too.
+    With a `store`, each cluster is also compared with postings from
+    earlier runs so reposts under a new URL are recognised; stored postings
+    only date a cluster and never merge two of this run's. This run's
+    fingerprints are staged on the store for `store.save()`.
+
+    Returns the remaining jobs and a dict of counts: 'exact' and 'near'
+    rows removed, 'new' postings and 'reposts' of earlier ones.
+    """
+    company = _normalized(df['Company'], normalize_text)
+    title = _normalized(df['Title'], normalize_title)
+    location = _normalized(df['Location'], normalize_text)
+    n = len(df)
+
+    # Hashed index of exact keys; rows without company or title stay unique
+    keys = pd.DataFrame({'company': company, 'title': title, 'location': location})
+    group = keys.groupby(['company', 'title', 'location'], sort=False).ngroup().to_numpy()
+    incomplete = (company == '') | (title == '')
+    group[incomplete] = group.max(initial=-1) + 1 + np.arange(int(incomplete.sum()))
+    # Group ids in order of first appearance, so a lower id is an earlier posting
+    group = pd.factorize(group)[0]
+    _, first_row = np.unique(group, return_index=True)
+    groups = len(first_row)
+
+    if store:
+        fingerprints = [fingerprint(company[r], title[r], location[r]) for r in first_row]
+        history = store.previous(set(fingerprints))
+        known = store.first_seen(fingerprints)
+    else:
+        fingerprints, known = [], {}
+        history = pd.DataFrame(columns=['fingerprint', 'company', 'title', 'location', 'first_seen'])
+
+    # Rows sharing a URL are the same posting whatever their titles say
+    parent = list(range(groups))
+    urls = df['URL'].astype(object).where(df['URL'].notna(), '').to_numpy()
+    shared = (urls != '') & pd.Series(urls).duplicated(keep=False).to_numpy()
+    for same_url in pd.Series(group[shared]).groupby(urls[shared], sort=False).unique():
+        for g in same_url[1:]:
+            _union(parent, same_url[0], g)
+    exact_root = np.array([_find(parent, g) for g in range(groups)])
+
+    # Near-duplicate titles within one company + location. Items are this
+    # run's comparable groups followed by the stored postings.
+    live = np.flatnonzero(~incomplete[first_row])
+    n_live = len(live)
+    item_company = np.concatenate([company[first_row][live], history['company'].to_numpy(dtype=object)])
+    item_title = np.concatenate([title[first_row][live], history['title'].to_numpy(dtype=object)])
+    item_location = np.concatenate([location[first_row][live], history['location'].to_numpy(dtype=object)])
+    title_codes, unique_titles = pd.factorize(item_title)
+    signatures = minhash_signatures(list(unique_titles))[title_codes]
+    # Only titles with as many words can match, so word count is part of the block
+    words = np.array([t.count(' ') for t in unique_titles], dtype=np.int64)[title_codes]
+    blocks = item_company + '\x1f' + item_location + '\x1f' + words.astype(str)
+
+    def verified(pairs):
+        # The same two titles recur across companies; verify each title pair once
+        k = len(unique_titles)
+        title_pairs = title_codes[pairs[:, 0]].astype(np.int64) * k + title_codes[pairs[:, 1]]
+        distinct, inverse = np.unique(title_pairs, return_inverse=True)
+        verdicts = np.array([is_near_duplicate(unique_titles[t // k], unique_titles[t % k])
+                             for t in distinct], dtype=bool)
+        return pairs[verdicts[inverse].reshape(-1)]
+
+    # Live postings are clustered among themselves only...
+    live_pairs = lsh_candidates(signatures[:n_live], blocks[:n_live])
+    for i, j in live[verified(live_pairs)].tolist():
+        _union(parent, i, j)
+    root = np.array([_find(parent, g) for g in range(groups)])
+
+    # ...then matched against stored postings, which only date a cluster and
+    # never merge two live ones. Stored items go first so each live item is
+    # paired with the stored item leading its LSH bucket.
+    order = np.r_[np.arange(n_live, len(item_title)), np.arange(n_live)]
+    pairs = order[lsh_candidates(signatures[order], blocks[order])]
+    pairs = pairs[(pairs[:, 0] >= n_live) & (pairs[:, 1] < n_live)]
+    history_matches = [(live[i], h - n_live) for h, i in verified(pairs).tolist()]
+
+    # Keep the first row of every cluster
+    row_root = root[group]
+    keep = np.zeros(n, dtype=bool)
+    keep[np.unique(row_root, return_index=True)[1]] = True
+    exact_keep = np.zeros(n, dtype=bool)
+    exact_keep[np.unique(exact_root[group], return_index=True)[1]] = True
+
+    # Earliest sighting per cluster, from the store
+    first_seen = {}
+    seen_before = [(g, known.get(fp)) for g, fp in enumerate(fingerprints)]
+    seen_before += [(g, history['first_seen'].iat[h]) for g, h in history_matches]
+    for g, day in seen_before:
+        if day:
+            r = root[g]
+            first_seen[r] = min(first_seen.get(r, day), day)
+    reposts = sum(1 for r in np.unique(row_root) if r in first_seen)
+
+    if store:
+        store.stage([
+            (fp, company[r], title[r], location[r], urls[r], first_seen.get(root[g]))
+            for g, (fp, r) in enumerate(zip(fingerprints, first_row)) if not incomplete[r]
+        ])
+
+    kept = int(keep.sum())
+    counts = {
+        'exact': n - int(exact_keep.sum()),
+        'near': int(exact_keep.sum()) - kept,
+        'new': kept - reposts if store else kept,
+        'reposts': reposts,
+    }
+    return df[keep], counts
+
+
+# ── Fingerprint store ───────────────────────────────────────
+
+class FingerprintStore:
+    """Normalized key and first/last sighting of every posting, kept in SQLite.
+
+    dedupe_jobs compares each run against the postings stored here, so a
+    job re-posted under a new URL keeps its original first-seen date.
+    Fingerprints are only written by `save()`, once the run has published.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS fingerprints ('
+                'fingerprint TEXT PRIMARY KEY, company TEXT, title TEXT, location TEXT, url TEXT, '
+                'first_seen TEXT, last_seen TEXT)'
+            )
+        self.pending = []
+
+    def first_seen(self, fingerprints):
+        """Fingerprint → first-seen date for the given fingerprints already stored."""
+        found = {}
+        fingerprints = list(fingerprints)
+        for start in range(0, len(fingerprints), 500):
+            chunk = fingerprints[start:start + 500]
+            found.update(self.conn.execute(
+                f"SELECT fingerprint, first_seen FROM fingerprints "
+                f"WHERE fingerprint IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+        return found
+
+    def previous(self, current):
+        """Stored postings whose fingerprint is not in `current`, as a DataFrame."""
+        rows = [row for row in self.conn.execute(
+            'SELECT fingerprint, company, title, location, first_seen FROM fingerprints'
+        ) if row[0] not in current]
+        return pd.DataFrame(rows, columns=['fingerprint', 'company', 'title', 'location', 'first_seen'])
+
+    def stage(self, rows):
+        """Queue (fingerprint, company, title, location, url, first_seen) rows for save()."""
+        self.pending = rows
+
+    def save(self, today=None):
+        today = today or datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        cutoff = (datetime.strptime(today, '%Y-%m-%d')
+                  - timedelta(days=FINGERPRINT_RETENTION_DAYS)).strftime('%Y-%m-%d')
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO fingerprints VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (fingerprint) DO UPDATE SET '
+                'url = excluded.url, last_seen = excluded.last_seen',
+                [(fp, co, title, loc, url, first or today, today)
+                 for fp, co, title, loc, url, first in self.pending],
+            )
+            self.conn.execute('DELETE FROM fingerprints WHERE last_seen < ?', (cutoff,))
+        print(f"  Fingerprints: saved {len(self.pending)} postings")
+        self.pending = []
+
+    def close(self):
+        self.conn.close()
+
+
+def open_fingerprint_store(path=None):
+    """Open the fingerprint store, or return None when it is disabled."""
+    path = JOB_FINGERPRINTS_PATH if path is None else path
+    if not path:
+        return None
+    return FingerprintStore(path)
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+from bvp_jobs_analyzer import job_identity, project_job, project_jobs
+
+# Local index of every job seen on the board; set JOB_INDEX_PATH='' to disable
+JOB_INDEX_PATH = os.environ.get('JOB_INDEX_PATH', '.cache/job_index.sqlite')
+
+
+def job_digest(job):
+    """Key and payload hash of one raw API job."""
+    key = json.dumps(job_identity(job))
+    payload = json.dumps(job, sort_keys=True)
+    return key, hashlib.sha256(payload.encode()).hexdigest(), payload
+
+
+class JobIndex:
+    """Last-seen payload hash of every job on the board, kept in SQLite.
+
+    An incremental crawl is diffed against it to find added, changed and
+    removed postings. Removals are only detected on complete crawls; when a
+    crawl stops early the jobs it did not reach are carried over from here.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'key TEXT PRIMARY KEY, hash TEXT, payload TEXT, first_seen TEXT, last_seen TEXT)'
+            )
+        self.hashes = dict(self.conn.execute('SELECT key, hash FROM jobs'))
+
+    def crawl(self, batches, stop_after=None):
+        """Diff `batches` against the index a page at a time; returns (jobs, complete).
+
+        Each page is hashed, queued for the index and projected into
+        JobRecords straight away, so only records and the key and hash of
+        every job are held for the whole crawl. Added and changed jobs are
+        collected for `finish()`, which also commits the new hashes.
+
+        With `stop_after`, pagination stops once that many consecutive pages
+        held only known, unchanged jobs. That assumes the board lists new and
+        updated postings first, so it is opt-in.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        self.seen = {}
+        self.changes = {'added': [], 'changed': []}
+        jobs = []
+        streak = 0
+        for batch in batches:
+            rows, unchanged = [], True
+            for job in batch:
+                if not isinstance(job, dict):
+                    continue
+                key, digest, payload = job_digest(job)
+                old = self.hashes.get(key)
+                unchanged = unchanged and old == digest
+                record = project_job(job)
+                jobs.append(record)
+                if key in self.seen:
+                    continue
+                self.seen[key] = digest
+                rows.append((key, digest, payload, now, now))
+                if old is None:
+                    self.changes['added'].append(record)
+                elif old != digest:
+                    self.changes['changed'].append(record)
+            # Left uncommitted until finish(), so a failed crawl changes nothing
+            self.conn.executemany(
+                'INSERT INTO jobs VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET '
+                'hash = excluded.hash, payload = excluded.payload, last_seen = excluded.last_seen',
+                rows,
+            )
+            if not stop_after:
+                continue
+            streak = streak + 1 if batch and unchanged else 0
+            if streak >= stop_after:
+                print(f"  Stopping after {streak} pages of unchanged jobs ({len(jobs)} fetched)")
+                return jobs, False
+        return jobs, True
+
+    def finish(self, jobs, complete):
+        """Commit the crawl and find the jobs it did not see.
+
+        Returns (jobs, changes): the crawled records, extended with indexed
+        jobs the crawl did not reach when it was incomplete, and a dict of
+        added, changed and removed records.
+        """
+        missing = [key for key in self.hashes if key not in self.seen]
+        unseen = project_jobs(json.loads(payload) for payload in self._payloads(missing))
+        changes = {**self.changes, 'removed': []}
+        if complete:
+            changes['removed'] = unseen
+        else:
+            jobs = jobs + unseen
+
+        with self.conn:
+            if complete:
+                self.conn.executemany('DELETE FROM jobs WHERE key = ?', [(key,) for key in missing])
+        self.hashes.update(self.seen)
+        if complete:
+            for key in missing:
+                del self.hashes[key]
+        return jobs, changes
+
+    def _payloads(self, keys):
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            yield from (row[0] for row in self.conn.execute(
+                f"SELECT payload FROM jobs WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+
+    def close(self):
+        self.conn.close()
+
+
+def open_job_index(path=None):
+    """Open the job index, or return None when it is disabled."""
+    path = JOB_INDEX_PATH if path is None else path
+    if not path:
+        return None
+    return JobIndex(path)
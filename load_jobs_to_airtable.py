@@ -1,18 +1,30 @@
+import numpy as np
 import pandas as pd
+import hashlib
+import json
 import re
 from collections import Counter
 from datetime import datetime, timezone
-import time
 import os
 from pyairtable import Api
 
-# Import the inference function from the scraper
+# Import the inference rules from the scraper
 import sys
 sys.path.insert(0, os.path.dirname(__file__))
-from bvp_jobs_analyzer import infer_function_from_title
+from bvp_jobs_analyzer import (
+    CSV_OUTPUT, FUNCTION_RULES, META_OUTPUT, OUTPUT_COLUMNS, OUTPUT_DTYPES, PARQUET_OUTPUT,
+    apply_output_schema,
+)
+from title_classifier import KeywordClassifier, attach_cache
+from airtable_writer import BatchWriter
+from history_store import open_history
+from job_dedup import dedupe_jobs, open_fingerprint_store
+from run_report import RUN_REPORT
 
 BASE_ID = 'appKRyK4KfiGX9ojv'
 PERSONAL_ACCESS_TOKEN = os.environ.get('AIRTABLE_TOKEN', 'YOUR_AIRTABLE_PERSONAL_ACCESS_TOKEN')
+# Point at fake_airtable.py (e.g. http://127.0.0.1:8766) to run the pipeline offline
+AIRTABLE_ENDPOINT_URL = os.environ.get('AIRTABLE_ENDPOINT_URL', 'https://api.airtable.com')
 
 # Table IDs
 JOBS_TABLE = 'tblHHC9JcSHscBn6S'
@@ -50,6 +62,91 @@ def is_test_job(title):
     return '[test]' in lower or 'test job' in lower or 'test department' in lower
 
 
+# Titles that can be non-English: no ASCII letter at all, or some CJK/Hangul.
+# Anything else has a Latin letter and no non-Latin ones, so it always passes.
+NON_ENGLISH_CANDIDATE_RE = re.compile(r'^[^A-Za-z]*$|' + NON_LATIN_RE.pattern)
+TEST_JOB_RE = re.compile(r'\[test\]|test job|test department')
+
+
+def exclusion_masks(df):
+    """Boolean row mask per exclusion reason, all computed in one stage.
+
+    Title checks run once per distinct title and are broadcast back to the
+    rows. One `str.contains` screens out titles that cannot be non-English,
+    and only the few left go through is_non_english_title; test postings
+    are a single regex over the lowercased titles. Missing titles are kept.
+    """
+    codes, uniques = pd.factorize(df['Title'])
+    titles = pd.Series(uniques, dtype=object)
+
+    candidates = titles.str.contains(NON_ENGLISH_CANDIDATE_RE, na=False).to_numpy(dtype=bool)
+    non_english = np.zeros(len(titles), dtype=bool)
+    non_english[candidates] = [is_non_english_title(t) for t in titles[candidates]]
+    test = titles.str.lower().str.contains(TEST_JOB_RE, na=False).to_numpy(dtype=bool)
+
+    def per_row(flags):
+        # Code -1 (missing title) picks the trailing False
+        return np.append(flags, False)[codes]
+
+    return {
+        'company': lookup_series(df['Company'], COMPANY_INDEX).isin(EXCLUDED_COMPANIES).to_numpy(dtype=bool),
+        'non_english': per_row(non_english),
+        'test': per_row(test),
+    }
+
+
+def filter_jobs(df):
+    """Drop excluded companies, non-English titles and test postings.
+
+    Returns the remaining jobs and the (companies, non-English, test)
+    removal counts; a job matching several reasons counts for the first.
+    """
+    masks = exclusion_masks(df)
+    removed = np.zeros(len(df), dtype=bool)
+    counts = []
+    for reason in ('company', 'non_english', 'test'):
+        hit = masks[reason] & ~removed
+        counts.append(int(hit.sum()))
+        removed |= hit
+    n_co, n_lang, n_test = counts
+
+    print(f"Excluded companies ({', '.join(EXCLUDED_COMPANIES)}): -{n_co}")
+    print(f"Non-English titles: -{n_lang}")
+    print(f"Test/junk postings: -{n_test}")
+    return df[~removed], (n_co, n_lang, n_test)
+
+
+# ── LOOKUP INDEXES ──────────────────────────────────────────
+# Name → value tables are re-keyed once at import so lookups ignore case and
+# whitespace, then applied a column at a time.
+
+def lookup_key(name):
+    """Case- and whitespace-insensitive form of a department or company name."""
+    return ' '.join(str(name).split()).casefold()
+
+
+def build_lookup(mapping, what):
+    """`mapping` re-keyed by lookup_key; raises ValueError on conflicting keys."""
+    index = {}
+    for name, value in mapping.items():
+        key = lookup_key(name)
+        if index.setdefault(key, value) != value:
+            raise ValueError(f"{what}: {name!r} normalizes to {key!r}, "
+                             f"which is already mapped to {index[key]!r}")
+    return index
+
+
+def lookup_series(values, index, default=None):
+    """Vectorized lookup in a build_lookup index, aligned to `values`.
+
+    Each distinct value is normalized and looked up once, then broadcast
+    back with one take. Unmatched and missing values give `default`.
+    """
+    codes, uniques = pd.factorize(values)
+    found = np.array([index.get(lookup_key(v), default) for v in uniques] + [default], dtype=object)
+    return pd.Series(found[codes], index=values.index, name=values.name)
+
+
 # ── BVP ROADMAP MAPPING ────────────────────────────────────
 # Maps portfolio company names → BVP investing roadmap.
 # Sourced from IR <> Talent Sync (Talent Portal Internal).
@@ -105,6 +202,51 @@ ROADMAP_MAP = {
     'Sila Nanotechnologies': 'Deep Tech',
 }
 
+# Company name variants (board spellings, legal names) → the name used above.
+# Case and spacing differences need no entry. Only list names specific enough
+# not to catch unrelated companies.
+COMPANY_ALIASES = {
+    'Perplexity': 'Perplexity AI',
+    'fal.ai': 'Fal',
+    'Writer, Inc.': 'Writer',
+    'Upwind': 'Upwind Security',
+    'Papaya': 'Papaya Global',
+    'Restaurant 365': 'Restaurant365',
+    'Unframe': 'Unframe AI',
+    'TRM': 'TRM Labs',
+    'Carr Riggs & Ingram': 'Carr, Riggs & Ingram',
+    'Carr, Riggs & Ingram (CRI)': 'Carr, Riggs & Ingram',
+    'Exploration Company': 'The Exploration Company',
+    'Viva Republica': 'Toss',
+}
+
+# Normalized company name → canonical name, for every company named in this file
+COMPANY_INDEX = build_lookup({
+    **{name: name for name in [*ROADMAP_MAP, *EXCLUDED_COMPANIES]},
+    **COMPANY_ALIASES,
+}, 'COMPANY_ALIASES')
+
+# Normalized company name or alias → roadmap
+ROADMAP_INDEX = {key: ROADMAP_MAP[name] for key, name in COMPANY_INDEX.items() if name in ROADMAP_MAP}
+
+
+def canonical_companies(companies):
+    """Company names with known variants replaced by the canonical name.
+
+    Names COMPANY_INDEX does not know are kept as they are, so a company
+    listed under two spellings counts once in every aggregate.
+    """
+    canonical = lookup_series(companies, COMPANY_INDEX)
+    canonical = canonical.where(canonical.notna(), companies.astype(object))
+    if isinstance(companies.dtype, pd.CategoricalDtype):
+        canonical = canonical.astype('category')
+    return canonical
+
+
+def roadmap_series(companies):
+    """BVP roadmap per row ('' when the company has none)."""
+    return lookup_series(companies, ROADMAP_INDEX, default='')
+
 
 # ── FUNCTION NORMALIZATION ──────────────────────────────────
 VALID = {
@@ -326,195 +468,520 @@ MAPPING = {
 }
 
 
-def enhanced_infer_function(title):
-    """Wrap the scraper's inference with additional patterns."""
-    if not isinstance(title, str):
-        return 'Unknown'
-    lower = title.lower()
-
+# Extra title rules checked before the scraper's FUNCTION_RULES
+ENHANCED_FUNCTION_RULES = [
     # Clinical patterns (check first — these are specific)
-    clinical_kw = [
+    ('Clinical', [
         'counselor', 'therapist', 'clinician', 'nurse', 'physician',
         'cardiology', 'cardiologist', 'medical director', 'psychiatr',
         'substance use', 'behavioral health', 'clinical supervisor',
         'pharmacy', 'pharmacist', 'dietitian', 'nutritionist',
         'social worker', 'case manager', 'care coordinator',
         'insurance advisor',
-    ]
-    if any(kw in lower for kw in clinical_kw):
-        return 'Clinical'
-
+    ]),
     # Additional Engineering patterns
-    eng_kw = ['dba', 'devops', 'sre ', 'site reliability',
-              'tech lead', 'network technician', 'security researcher',
-              'security analyst', 'ml manager', 'machine learning']
-    if any(kw in lower for kw in eng_kw):
-        return 'Engineering'
-
+    ('Engineering', ['dba', 'devops', 'sre ', 'site reliability',
+                     'tech lead', 'network technician', 'security researcher',
+                     'security analyst', 'ml manager', 'machine learning']),
     # Additional Design patterns
-    if 'interior designer' in lower or 'graphic designer' in lower:
-        return 'Design'
-
+    ('Design', ['interior designer', 'graphic designer']),
     # Additional Operations patterns
-    ops_kw = ['general affairs', 'purchasing manager', 'barista',
-              'merchandising', 'validation manager', 'regional manager',
-              'operations lead']
-    if any(kw in lower for kw in ops_kw):
-        return 'Operations'
-
+    ('Operations', ['general affairs', 'purchasing manager', 'barista',
+                    'merchandising', 'validation manager', 'regional manager',
+                    'operations lead']),
     # Additional Finance patterns
-    fin_kw = ['tax ', 'tax,', 'auditor', 'bookkeep', 'controller',
-              'accounts payable', 'accounts receivable', 'cpa', 'cfo']
-    if any(kw in lower for kw in fin_kw):
-        return 'Finance'
-
+    ('Finance', ['tax ', 'tax,', 'auditor', 'bookkeep', 'controller',
+                 'accounts payable', 'accounts receivable', 'cpa', 'cfo']),
     # Additional Sales patterns
-    if 'business manager - sales' in lower or 'project executive' in lower:
-        return 'Sales'
-
+    ('Sales', ['business manager - sales', 'project executive']),
     # Additional IT patterns
-    if 'it manager' in lower or 'it sox' in lower or 'idc network' in lower:
-        return 'IT'
-
+    ('IT', ['it manager', 'it sox', 'idc network']),
     # Additional Legal patterns
-    if 'aml ' in lower or 'kyc ' in lower or 'compliance' in lower:
-        return 'Legal & Compliance'
-
+    ('Legal & Compliance', ['aml ', 'kyc ', 'compliance']),
     # Additional Customer Success
-    if 'customer hero' in lower or 'customer protection' in lower:
-        return 'Customer Success'
+    ('Customer Success', ['customer hero', 'customer protection']),
+]
 
-    # Fall back to the scraper's inference
-    return infer_function_from_title(title)
+# Enhanced rules first, then fall back to the scraper's inference
+ENHANCED_FUNCTION_CLASSIFIER = KeywordClassifier(
+    ENHANCED_FUNCTION_RULES + FUNCTION_RULES, default='Unknown'
+)
+
+
+def enhanced_infer_function(title):
+    """Wrap the scraper's inference with additional patterns."""
+    if not isinstance(title, str):
+        return 'Unknown'
+    return ENHANCED_FUNCTION_CLASSIFIER.classify(title)
+
+
+# Normalized department → function; canonical names map to themselves
+DEPARTMENT_INDEX = build_lookup({**MAPPING, **{name: name for name in VALID}}, 'MAPPING')
 
 
 def normalize(func):
-    if func in VALID:
-        return func
-    mapped = MAPPING.get(func)
-    if mapped:
-        return mapped
-    return None
+    if not isinstance(func, str):
+        return None
+    return DEPARTMENT_INDEX.get(lookup_key(func))
+
+
+def normalize_series(funcs):
+    """Vectorized `normalize`: None where the department is unmapped."""
+    return lookup_series(funcs, DEPARTMENT_INDEX)
+
+
+def unmapped_report(df, top=20):
+    """Departments missing from MAPPING and companies without a roadmap, by job count."""
+    departments = df.loc[normalize_series(df['Function']).isna(), 'Function'].astype(object)
+    departments = departments[departments != 'Unknown'].value_counts()
+    companies = df.loc[roadmap_series(df['Company']) == '', 'Company'].astype(object).value_counts()
+    if len(departments):
+        print(f"\nDepartments not in MAPPING ({len(departments)} distinct, "
+              f"{departments.sum()} jobs, inferred from title):")
+        for name, count in departments.head(top).items():
+            print(f"  {count:5d}  {name}")
+    if len(companies):
+        print(f"\nCompanies without a BVP roadmap ({len(companies)} of {df['Company'].nunique()}):")
+        print('  ' + ', '.join(f"{name} ({count})" for name, count in companies.head(top).items()))
+
+
+def normalize_functions(df):
+    """Add the 'Fixed' function column: mapped department, else inferred from title."""
+    df = df.copy()
+    df['Fixed'] = normalize_series(df['Function'])
+    needs = df['Fixed'].isna()
+    print(f"Inferring from title for {needs.sum()} unmapped departments...")
+    df.loc[needs, 'Fixed'] = ENHANCED_FUNCTION_CLASSIFIER.classify_series(df.loc[needs, 'Title'])
+    return df
+
+
+# ── DATA LOADING ────────────────────────────────────────────
+LOAD_REPORT_OUTPUT = 'bvp_jobs_load_report.json'
+
+# Refuse to publish a crawl that saw less than this share of the API's total
+MIN_CRAWL_COVERAGE = float(os.environ.get('MIN_CRAWL_COVERAGE', '0.9'))
+# Set JOBS_ALLOW_PARTIAL=1 to publish anyway
+ALLOW_PARTIAL_CRAWL = os.environ.get('JOBS_ALLOW_PARTIAL') == '1'
+
+
+def load_jobs_frame(csv_path=CSV_OUTPUT, parquet_path=PARQUET_OUTPUT):
+    """Load the scraper's output with the handoff schema enforced.
+
+    Prefers the Parquet file when it is at least as new as the CSV; the CSV
+    is read with explicit dtypes so nothing is re-inferred. Blank strings are
+    treated as missing in both cases, as pd.read_csv does.
+    """
+    use_parquet = os.path.exists(parquet_path) and (
+        not os.path.exists(csv_path) or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+    )
+    if use_parquet:
+        print(f"\nLoading Parquet data from {parquet_path}...")
+        df = pd.read_parquet(parquet_path)
+        for col in OUTPUT_COLUMNS:
+            if col not in df.columns:
+                continue
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                if '' in df[col].cat.categories:
+                    df[col] = df[col].cat.remove_categories([''])
+            else:
+                df[col] = df[col].mask(df[col] == '')
+    else:
+        print(f"\nLoading CSV data from {csv_path}...")
+        df = pd.read_csv(csv_path, dtype=OUTPUT_DTYPES)
+    return apply_output_schema(df)
+
+
+def crawl_problems(df, meta_path=META_OUTPUT):
+    """Reasons the scraper output looks truncated, from its metadata sidecar."""
+    if not os.path.exists(meta_path):
+        print(f"  ⚠️  No crawl metadata ({meta_path}), skipping truncation check")
+        return []
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    problems = []
+    if meta.get('rows') != len(df):
+        problems.append(f"loaded {len(df)} rows but the scraper wrote {meta.get('rows')}")
+    total = meta.get('reported_total')
+    seen = meta.get('jobs_seen') or 0
+    if total and seen < total * MIN_CRAWL_COVERAGE:
+        problems.append(f"crawl saw {seen} of the {total} jobs the API reported "
+                        f"({seen / total:.0%} < {MIN_CRAWL_COVERAGE:.0%})")
+    if not meta.get('complete', True):
+        print("  ⚠️  Crawl did not reach the last page")
+    return problems
+
+
+# ── INCREMENTAL SYNC ────────────────────────────────────────
+# 'sync' diffs against the live table; 'reload' rewrites every row in place.
+JOBS_SYNC_MODE = os.environ.get('JOBS_SYNC_MODE', 'sync')
+
+# Fields that change every run and should not by themselves trigger an update
+SYNC_IGNORED_FIELDS = {'Last Updated'}
+
+# Set JOBS_FORCE_STAGES=1 to write every stage even if its records are unchanged
+FORCE_ALL_STAGES = os.environ.get('JOBS_FORCE_STAGES') == '1'
+
+# Company Analytics fields only set for some companies; cleared when absent
+COMPANY_OPTIONAL_FIELDS = ('BVP Roadmap', 'Previous Week Jobs', 'WoW Change')
+
+
+def job_key(fields):
+    """Stable identity for a job: its URL, else company + title + location."""
+    url = str(fields.get('URL') or '').strip()
+    if url:
+        return url
+    return '|'.join(
+        str(fields.get(name) or '').strip().lower()
+        for name in ('Company', 'Job Title', 'Location')
+    )
+
+
+def _keyed(items, key_fn):
+    """Yield ((key, occurrence), item) so repeated keys stay distinct rows."""
+    seen = Counter()
+    for item in items:
+        key = key_fn(item)
+        yield (key, seen[key]), item
+        seen[key] += 1
+
+
+def field_key(name):
+    """key_fn matching records on a single field."""
+    return lambda fields: str(fields.get(name) or '')
+
+
+def _merge_key(fields, key_fields):
+    return tuple(str(fields.get(name) or '') for name in key_fields)
+
+
+def _fields_differ(current, desired):
+    for name, value in desired.items():
+        if name in SYNC_IGNORED_FIELDS:
+            continue
+        old = current.get(name, '')
+        if isinstance(value, float) and isinstance(old, (int, float)):
+            if abs(old - value) > 1e-9:
+                return True
+        elif old != value and not (old in ('', None) and value in ('', None)):
+            return True
+    return False
+
+
+def sync_table(table, records, key_fn, writer, optional=(), key_fields=None, rewrite=False):
+    """Bring a table in line with `records`, touching only rows that changed.
+
+    Existing records are fetched once and matched to the desired records by
+    `key_fn`. New keys are created, changed rows are updated and keys that
+    disappeared are deleted. `optional` names fields a record may leave out;
+    they are cleared on update when missing. With `rewrite`, every matched
+    row is written whether it changed or not.
+
+    With `key_fields`, creates and updates go out together as batch upserts
+    merged on those fields (updates by record id), so both share batches of
+    10; new records whose key fields are blank or repeated cannot be merged
+    on and are created normally. Stale rows are deleted last, so the table
+    is never missing a row that is being replaced. Returns (created,
+    updated, deleted) counts.
+    """
+    existing = dict(_keyed(writer.fetch_all(table), lambda r: key_fn(r['fields'])))
+
+    creates, updates = [], []
+    for key, fields in _keyed(records, key_fn):
+        current = existing.pop(key, None)
+        if current is None:
+            creates.append(fields)
+            continue
+        desired = {**{name: None for name in optional}, **fields}
+        if rewrite or _fields_differ(current['fields'], desired):
+            updates.append({'id': current['id'], 'fields': desired})
+    deletes = [r['id'] for r in existing.values()]
+
+    if key_fields:
+        counts = Counter(_merge_key(fields, key_fields) for fields in records)
+        upserts, unmergeable = list(updates), []
+        for fields in creates:
+            key = _merge_key(fields, key_fields)
+            # A blank or repeated key would merge into the wrong row (or several)
+            if all(key) and counts[key] == 1:
+                upserts.append({'fields': fields})
+            else:
+                unmergeable.append(fields)
+        creates = unmergeable
+        result = writer.upsert(table, upserts, key_fields)
+        writer.create(table, creates)
+        created = len(result['createdRecords']) + len(creates)
+        updated = len(result['updatedRecords'])
+    else:
+        writer.update(table, updates)
+        writer.create(table, creates)
+        created, updated = len(creates), len(updates)
+    writer.delete(table, deletes)
+
+    return created, updated, len(deletes)
+
+
+def records_digest(records):
+    """Order-independent hash of records, ignoring SYNC_IGNORED_FIELDS."""
+    rows = sorted(
+        json.dumps({k: v for k, v in r.items() if k not in SYNC_IGNORED_FIELDS}, sort_keys=True)
+        for r in records
+    )
+    return hashlib.sha256('\n'.join(rows).encode()).hexdigest()
+
+
+def stage_unchanged(history, stage, digest):
+    """True when `stage` last wrote exactly these records (and may be skipped)."""
+    if history is None or FORCE_ALL_STAGES or history.stage_digest(stage) != digest:
+        return False
+    print(f"  Unchanged since last run, skipping ({digest[:12]})")
+    return True
+
 
+def write_stage(stage, table, records, key_fn, writer, history, optional=(), key_fields=None):
+    """sync_table() unless the records match the last successful run of `stage`.
+
+    Returns (created, updated, deleted), or None when the stage was skipped.
+    """
+    digest = records_digest(records)
+    if stage_unchanged(history, stage, digest):
+        return None
+    result = sync_table(table, records, key_fn, writer, optional, key_fields)
+    if history is not None:
+        history.save_stage_digest(stage, digest)
+    return result
 
-def clear_table(table):
-    existing = table.all()
-    if existing:
-        ids = [r['id'] for r in existing]
-        for i in range(0, len(ids), 10):
-            table.batch_delete(ids[i:i + 10])
-            time.sleep(0.2)
-    return len(existing)
 
+def _stage_summary(result):
+    if result is None:
+        return " (unchanged, skipped)"
+    created, updated, deleted = result
+    return f" ({created} created, {updated} updated, {deleted} deleted)"
 
-def get_previous_company_totals(api):
+
+def get_previous_company_totals(api, writer):
     """Read current Company Analytics to capture last week's job counts."""
     table = api.table(BASE_ID, COMPANY_ANALYTICS_TABLE)
-    records = table.all()
+    records = writer.fetch_all(table)
     return {
         r['fields'].get('Company Name', ''): r['fields'].get('Total Jobs', 0)
         for r in records if r['fields'].get('Company Name')
     }
 
 
+# ── AGGREGATION ─────────────────────────────────────────────
+
+# Functions broken out as their own columns in Company Analytics / Snapshots
+FOCUS_FUNCTIONS = {
+    'Engineering': 'eng',
+    'Sales': 'sales',
+    'Marketing': 'mktg',
+    'Product': 'prod',
+}
+
+
+def compute_analytics(df):
+    """Compute every analytics table's metrics in one vectorized pass.
+
+    The per-row flags (remote, level, roadmap, focus functions) are built
+    once and summed with named aggregations per grain, so no group is ever
+    masked or copied again. Returns a dict of DataFrames for 'functions', 'companies'
+    and 'clusters' plus a 'snapshot' dict of portfolio-wide totals.
+    """
+    flags = pd.DataFrame({
+        'Company': df['Company'],
+        'Fixed': df['Fixed'],
+        'Level': df['Level'],
+        'Title': df['Title'],
+        'roadmap': roadmap_series(df['Company']),
+        'remote': df['Remote'] == 'Yes',
+        'executive': df['Level'] == 'Executive',
+        'senior': df['Level'] == 'Senior',
+        **{key: df['Fixed'] == func for func, key in FOCUS_FUNCTIONS.items()},
+    })
+    focus = {key: (key, 'sum') for key in FOCUS_FUNCTIONS.values()}
+
+    functions = flags.groupby('Fixed', observed=True).agg(
+        total=('remote', 'size'),
+        remote=('remote', 'sum'),
+        companies=('Company', 'nunique'),
+        executive=('executive', 'sum'),
+        senior=('senior', 'sum'),
+    )
+
+    companies = flags.groupby('Company', observed=True).agg(
+        total=('remote', 'size'),
+        remote=('remote', 'sum'),
+        funcs=('Fixed', 'nunique'),
+        roadmap=('roadmap', 'first'),
+        **focus,
+    ).sort_values('total', ascending=False, kind='stable')
+
+    totals = flags[['remote', *FOCUS_FUNCTIONS.values()]].sum()
+    snapshot = {
+        'total': len(flags),
+        'companies': flags['Company'].nunique(),
+        **{key: int(count) for key, count in totals.items()},
+    }
+
+    # Talent pooling: Function + Level clusters with 3+ companies hiring
+    pool = flags[flags['Fixed'] != 'Unknown']
+    clusters = pool.groupby(['Fixed', 'Level'], observed=True).agg(
+        n_companies=('Company', 'nunique'),
+        total=('remote', 'size'),
+        remote=('remote', 'sum'),
+    )
+    clusters = clusters[clusters['n_companies'] >= 3]
+    pool = pool.join(clusters[[]], on=['Fixed', 'Level'], how='inner')
+    keys = ['Fixed', 'Level']
+    clusters['companies'] = (
+        pool[keys + ['Company']].dropna().drop_duplicates()
+        .sort_values('Company').groupby(keys, observed=True)['Company'].agg(list)
+    )
+    # Top 5 exact titles per cluster. value_counts over each cluster's rows, in
+    # row order, exactly as before: its order for equal counts is what Airtable
+    # holds, and any other tie order would rewrite those records
+    clusters['titles'] = pool.groupby(keys, observed=True)['Title'].agg(
+        lambda titles: [f"{title} ({count})" for title, count in titles.value_counts().head(5).items()]
+    )
+    # Top 3 roadmaps by companies hiring; equal counts keep company-name order
+    hiring = pool.loc[pool['roadmap'] != '', keys + ['Company', 'roadmap']].drop_duplicates()
+    roadmaps = (
+        hiring.sort_values('Company', kind='stable')
+        .groupby(keys + ['roadmap'], observed=True, sort=False).size().reset_index(name='count')
+        .sort_values('count', ascending=False, kind='stable')
+        .groupby(keys, observed=True).head(3)
+    )
+    roadmaps['label'] = roadmaps['roadmap'] + ' (' + roadmaps['count'].astype(str) + ')'
+    clusters['roadmaps'] = roadmaps.groupby(keys, observed=True)['label'].agg(list)
+
+    return {
+        'functions': functions,
+        'companies': companies,
+        'snapshot': snapshot,
+        'clusters': clusters.sort_values('n_companies', ascending=False, kind='stable'),
+    }
+
+
+def cluster_priority(n_companies):
+    """Priority bucket for a talent pooling cluster, by company count."""
+    if n_companies >= 15:
+        return 'Critical (15+ companies)'
+    if n_companies >= 10:
+        return 'High (10-14 companies)'
+    if n_companies >= 5:
+        return 'Medium (5-9 companies)'
+    return 'Low (3-4 companies)'
+
+
 # ── PIPELINE STEPS ──────────────────────────────────────────
 
-def upload_jobs(df, api):
+# DataFrame column → Jobs table field
+JOB_FIELDS = {
+    'Title': 'Job Title',
+    'Company': 'Company',
+    'Fixed': 'Function',
+    'Level': 'Level',
+    'Location': 'Location',
+    'Remote': 'Remote',
+    'URL': 'URL',
+}
+
+
+def build_job_records(df, now):
+    """Jobs table field dicts, formatted a column at a time.
+
+    Each column is converted to strings once (missing values become 'nan',
+    as str() would, except URL which becomes ''), then the columns are
+    zipped into records sharing the single `now` timestamp.
+    """
+    columns = {}
+    for col, field in JOB_FIELDS.items():
+        values = df[col].astype(object)
+        if col == 'URL':
+            values = values.where(values.notna(), '')
+        columns[field] = values.astype(str).tolist()
+    columns['Last Updated'] = [now] * len(df)
+    fields = list(columns)
+    return [dict(zip(fields, row)) for row in zip(*columns.values())]
+
+
+def upload_jobs(df, api, writer, history=None):
     print("\n" + "=" * 60)
     print("STEP 1: Upload Jobs")
     print("=" * 60)
 
     table = api.table(BASE_ID, JOBS_TABLE)
-    cleared = clear_table(table)
-    print(f"  Cleared {cleared} old records")
-
-    print(f"Uploading {len(df)} jobs...")
-    total_batches = (len(df) + 9) // 10
-    for i in range(0, len(df), 10):
-        records = []
-        for _, row in df.iloc[i:i + 10].iterrows():
-            records.append({
-                'Job Title': str(row['Title']),
-                'Company': str(row['Company']),
-                'Function': str(row['Fixed']),
-                'Level': str(row['Level']),
-                'Location': str(row['Location']),
-                'Remote': str(row['Remote']),
-                'URL': str(row['URL']) if pd.notna(row['URL']) else '',
-                'Last Updated': datetime.now(timezone.utc).isoformat()
-            })
-        table.batch_create(records)
-        batch_num = i // 10 + 1
-        if batch_num % 100 == 0:
-            print(f"  Batch {batch_num}/{total_batches}")
-        time.sleep(0.2)
-
-    print(f"✅ Jobs uploaded! ({len(df[df['Fixed'] == 'Unknown'])} Unknown)")
-
-
-def update_function_analytics(df, api):
+    records = build_job_records(df, datetime.now(timezone.utc).isoformat())
+
+    if JOBS_SYNC_MODE == 'sync':
+        print(f"Syncing {len(records)} jobs against existing table...")
+        result = write_stage('Jobs', table, records, job_key, writer, history, key_fields=['URL'])
+    else:
+        print(f"Rewriting all {len(records)} jobs...")
+        result = sync_table(table, records, job_key, writer, key_fields=['URL'], rewrite=True)
+        if history is not None:
+            history.save_stage_digest('Jobs', records_digest(records))
+    if result:
+        created, updated, deleted = result
+        unchanged = len(records) - created - updated
+        print(f"  Created {created}, updated {updated}, deleted {deleted}, unchanged {unchanged}")
+    print(f"✅ Jobs uploaded! ({int((df['Fixed'] == 'Unknown').sum())} Unknown)")
+
+
+def update_function_analytics(metrics, api, writer, history=None):
     print("\n" + "=" * 60)
     print("STEP 2: Function Analytics")
     print("=" * 60)
 
     table = api.table(BASE_ID, FUNCTION_ANALYTICS_TABLE)
-    cleared = clear_table(table)
-    print(f"  Cleared {cleared} old records")
 
-    total_jobs = len(df)
+    total_jobs = metrics['snapshot']['total']
+    now = datetime.now(timezone.utc).isoformat()
     records = []
-    for func_name, group in df.groupby('Fixed'):
-        remote_count = len(group[group['Remote'] == 'Yes'])
+    for func_name, f in metrics['functions'].iterrows():
         records.append({
             'Function': str(func_name),
-            'Total Jobs': int(len(group)),
-            'Percentage of Total': len(group) / total_jobs if total_jobs > 0 else 0,
-            'Remote Jobs': int(remote_count),
-            'Remote Percentage': remote_count / len(group) if len(group) > 0 else 0,
-            'Companies Hiring': int(group['Company'].nunique()),
-            'Executive Roles': int(len(group[group['Level'] == 'Executive'])),
-            'Senior Roles': int(len(group[group['Level'] == 'Senior'])),
-            'Last Updated': datetime.now(timezone.utc).isoformat()
+            'Total Jobs': int(f['total']),
+            'Percentage of Total': f['total'] / total_jobs if total_jobs > 0 else 0,
+            'Remote Jobs': int(f['remote']),
+            'Remote Percentage': f['remote'] / f['total'],
+            'Companies Hiring': int(f['companies']),
+            'Executive Roles': int(f['executive']),
+            'Senior Roles': int(f['senior']),
+            'Last Updated': now
         })
 
-    for i in range(0, len(records), 10):
-        table.batch_create(records[i:i + 10])
-        time.sleep(0.2)
-    print(f"✅ Created {len(records)} function analytics records")
+    result = write_stage('Function Analytics', table, records, field_key('Function'), writer, history,
+                         key_fields=['Function'])
+    print(f"✅ {len(records)} function analytics records{_stage_summary(result)}")
 
 
-def update_company_analytics(df, api, prev_totals):
+def update_company_analytics(metrics, api, writer, prev_totals, history=None):
     print("\n" + "=" * 60)
     print("STEP 3: Company Analytics (with Roadmap + Velocity)")
     print("=" * 60)
 
     table = api.table(BASE_ID, COMPANY_ANALYTICS_TABLE)
-    cleared = clear_table(table)
-    print(f"  Cleared {cleared} old records")
 
+    # Velocity is computed for every company; only the top 50 are uploaded
     stats = []
-    for company, group in df.groupby('Company'):
-        remote_count = len(group[group['Remote'] == 'Yes'])
-        total = len(group)
+    for company, c in metrics['companies'].iterrows():
+        total = int(c['total'])
         prev = prev_totals.get(company)
-
         stats.append({
             'company': str(company),
             'total': total,
-            'eng': int(len(group[group['Fixed'] == 'Engineering'])),
-            'sales': int(len(group[group['Fixed'] == 'Sales'])),
-            'mktg': int(len(group[group['Fixed'] == 'Marketing'])),
-            'prod': int(len(group[group['Fixed'] == 'Product'])),
-            'remote_pct': remote_count / total if total > 0 else 0,
-            'funcs': int(group['Fixed'].nunique()),
-            'roadmap': ROADMAP_MAP.get(company, ''),
+            **{key: int(c[key]) for key in FOCUS_FUNCTIONS.values()},
+            'remote_pct': c['remote'] / total,
+            'funcs': int(c['funcs']),
+            'roadmap': c['roadmap'],
             'prev': prev,
             'wow': total - prev if prev is not None else None,
         })
-
-    stats.sort(key=lambda x: x['total'], reverse=True)
     top_50 = stats[:50]
 
+    now = datetime.now(timezone.utc).isoformat()
     records = []
     for s in top_50:
         rec = {
@@ -526,7 +993,7 @@ def update_company_analytics(df, api, prev_totals):
             'Product Jobs': s['prod'],
             'Remote Percentage': s['remote_pct'],
             'Unique Functions': s['funcs'],
-            'Last Updated': datetime.now(timezone.utc).isoformat(),
+            'Last Updated': now,
         }
         if s['roadmap']:
             rec['BVP Roadmap'] = s['roadmap']
@@ -536,12 +1003,11 @@ def update_company_analytics(df, api, prev_totals):
             rec['WoW Change'] = int(s['wow'])
         records.append(rec)
 
-    for i in range(0, len(records), 10):
-        table.batch_create(records[i:i + 10])
-        time.sleep(0.2)
+    result = write_stage('Company Analytics', table, records, field_key('Company Name'), writer,
+                         history, optional=COMPANY_OPTIONAL_FIELDS, key_fields=['Company Name'])
 
     # Print velocity highlights
-    movers = [s for s in top_50 if s['wow'] is not None and s['wow'] != 0]
+    movers = [s for s in stats if s['wow'] is not None and s['wow'] != 0]
     movers.sort(key=lambda x: x['wow'], reverse=True)
     if movers:
         up = [s for s in movers if s['wow'] > 0]
@@ -556,35 +1022,45 @@ def update_company_analytics(df, api, prev_totals):
                 print(f"     {s['company']}: {s['wow']} jobs ({s['prev']} → {s['total']})")
 
     roadmap_count = sum(1 for s in top_50 if s['roadmap'])
-    print(f"\n✅ Created {len(records)} company analytics records ({roadmap_count} with roadmap)")
+    print(f"\n✅ {len(records)} company analytics records ({roadmap_count} with roadmap)"
+          f"{_stage_summary(result)}")
 
 
-def create_weekly_snapshot(df, api):
+def create_weekly_snapshot(metrics, api, writer, previous=None, history=None):
     print("\n" + "=" * 60)
     print("STEP 4: Weekly Snapshot")
     print("=" * 60)
 
     table = api.table(BASE_ID, WEEKLY_SNAPSHOTS_TABLE)
-    remote_count = len(df[df['Remote'] == 'Yes'])
+    totals = metrics['snapshot']
 
     snapshot = {
         'Snapshot Date': datetime.now(timezone.utc).strftime('%Y-%m-%d'),
-        'Total Jobs': int(len(df)),
-        'Total Companies Hiring': int(df['Company'].nunique()),
-        'Engineering Jobs': int(len(df[df['Fixed'] == 'Engineering'])),
-        'Sales Jobs': int(len(df[df['Fixed'] == 'Sales'])),
-        'Marketing Jobs': int(len(df[df['Fixed'] == 'Marketing'])),
-        'Product Jobs': int(len(df[df['Fixed'] == 'Product'])),
-        'Remote Jobs': int(remote_count),
-        'Remote Percentage': remote_count / len(df) if len(df) > 0 else 0,
+        'Total Jobs': int(totals['total']),
+        'Total Companies Hiring': int(totals['companies']),
+        'Engineering Jobs': totals['eng'],
+        'Sales Jobs': totals['sales'],
+        'Marketing Jobs': totals['mktg'],
+        'Product Jobs': totals['prod'],
+        'Remote Jobs': totals['remote'],
+        'Remote Percentage': totals['remote'] / totals['total'] if totals['total'] > 0 else 0,
         'Notes': 'Automated weekly update'
     }
 
-    table.create(snapshot)
+    # Snapshots are append-only; this only skips a same-day rerun with identical data
+    digest = records_digest([snapshot])
+    if stage_unchanged(history, 'Weekly Snapshot', digest):
+        return
+    writer.call(table.create, snapshot, records=1, idempotent=False)
+    if history is not None:
+        history.save_stage_digest('Weekly Snapshot', digest)
     print(f"✅ Snapshot: {snapshot['Snapshot Date']} — {snapshot['Total Jobs']} jobs, {snapshot['Total Companies Hiring']} companies")
+    if previous:
+        print(f"  vs {previous['date']}: {snapshot['Total Jobs'] - previous['total']:+d} jobs, "
+              f"{snapshot['Total Companies Hiring'] - previous['companies']:+d} companies")
 
 
-def update_talent_pooling(df, api):
+def update_talent_pooling(metrics, api, writer, history=None):
     """Cluster demand by Function + Level across the portfolio.
 
     Instead of grouping by exact job title (which fragments the signal),
@@ -598,84 +1074,42 @@ def update_talent_pooling(df, api):
     print("=" * 60)
 
     table = api.table(BASE_ID, TALENT_POOLING_TABLE)
-    cleared = clear_table(table)
-    print(f"  Cleared {cleared} old records")
-
-    # Filter out Unknown function — not useful for talent pooling
-    pool_df = df[df['Fixed'] != 'Unknown'].copy()
 
+    # Unknown function and clusters with < 3 companies are already dropped
+    now = datetime.now(timezone.utc).isoformat()
     clusters = []
-    for (func, level), group in pool_df.groupby(['Fixed', 'Level']):
-        companies = sorted(set(group['Company']))
-        n_companies = len(companies)
-
-        # Only include clusters with 3+ companies hiring
-        if n_companies < 3:
-            continue
-
-        total_openings = len(group)
-        remote_count = len(group[group['Remote'] == 'Yes'])
-        remote_pct = remote_count / total_openings if total_openings > 0 else 0
-
-        # Top 5 most common exact titles in this cluster
-        title_counts = group['Title'].value_counts()
-        sample_titles = []
-        for title, count in title_counts.head(5).items():
-            sample_titles.append(f"{title} ({count})")
+    for (func, level), c in metrics['clusters'].iterrows():
+        companies = c['companies']
 
         # Roadmap concentration: which roadmaps appear most in this cluster
-        roadmap_companies = [
-            ROADMAP_MAP[c] for c in companies if c in ROADMAP_MAP
-        ]
-        roadmap_summary = ''
-        if roadmap_companies:
-            rc = Counter(roadmap_companies).most_common(3)
-            roadmap_summary = ', '.join(f"{rm} ({ct})" for rm, ct in rc)
-
-        # Priority based on company count
-        if n_companies >= 15:
-            priority = 'Critical (15+ companies)'
-        elif n_companies >= 10:
-            priority = 'High (10-14 companies)'
-        elif n_companies >= 5:
-            priority = 'Medium (5-9 companies)'
-        else:
-            priority = 'Low (3-4 companies)'
-
-        # Role Cluster label: "Level Function" e.g. "Senior Engineering"
-        cluster_label = f"{level} {func}"
+        roadmap_summary = ', '.join(c['roadmaps']) if isinstance(c['roadmaps'], list) else ''
 
         clusters.append({
-            'Role Cluster': cluster_label,
-            'Number of Companies': int(n_companies),
-            'Total Openings': int(total_openings),
+            # Role Cluster label: "Level Function" e.g. "Senior Engineering"
+            'Role Cluster': f"{level} {func}",
+            'Number of Companies': int(c['n_companies']),
+            'Total Openings': int(c['total']),
             'Companies': ', '.join(companies),
             'Function': str(func),
             'Level': str(level),
-            'Priority': priority,
-            'Last Updated': datetime.now(timezone.utc).isoformat(),
+            'Priority': cluster_priority(c['n_companies']),
+            'Last Updated': now,
             # New fields (require manual creation in Airtable)
-            'Sample Titles': '\n'.join(sample_titles),
-            'Remote Percentage': remote_pct,
+            'Sample Titles': '\n'.join(c['titles']),
+            'Remote Percentage': c['remote'] / c['total'],
             'Top Roadmaps': roadmap_summary,
         })
 
-    # Sort: highest company count first
-    clusters.sort(key=lambda x: x['Number of Companies'], reverse=True)
-
     # Upload
-    uploaded = 0
-    for i in range(0, len(clusters), 10):
-        table.batch_create(clusters[i:i + 10])
-        uploaded += len(clusters[i:i + 10])
-        time.sleep(0.2)
+    result = write_stage('Talent Pooling', table, clusters, field_key('Role Cluster'), writer, history,
+                         key_fields=['Role Cluster'])
 
     # Print highlights
     print(f"\n  Top demand clusters:")
     for c in clusters[:10]:
         print(f"    {c['Role Cluster']}: {c['Number of Companies']} companies, {c['Total Openings']} openings")
 
-    print(f"\n✅ Created {len(clusters)} talent pooling clusters")
+    print(f"\n✅ {len(clusters)} talent pooling clusters{_stage_summary(result)}")
 
 
 # ── MAIN ────────────────────────────────────────────────────
@@ -689,72 +1123,105 @@ def main():
         print("ERROR: Set AIRTABLE_TOKEN environment variable")
         return
 
-    api = Api(PERSONAL_ACCESS_TOKEN)
+    # Retries and rate limiting are handled by the shared BatchWriter
+    api = Api(PERSONAL_ACCESS_TOKEN, retry_strategy=None, endpoint_url=AIRTABLE_ENDPOINT_URL)
+    writer = BatchWriter()
 
-    # Load CSV
-    print("\nLoading CSV data...")
-    df = pd.read_csv('bvp_jobs_analysis.csv')
+    # Load scraper output
+    with RUN_REPORT.stage('Load'):
+        df = load_jobs_frame()
     raw = len(df)
-    print(f"Raw CSV: {raw} jobs")
-
-    # Filter: excluded companies
-    df = df[~df['Company'].isin(EXCLUDED_COMPANIES)]
-    n_co = raw - len(df)
-    print(f"Excluded companies ({', '.join(EXCLUDED_COMPANIES)}): -{n_co}")
-
-    # Filter: non-English titles
-    pre = len(df)
-    df = df[~df['Title'].apply(is_non_english_title)]
-    n_lang = pre - len(df)
-    print(f"Non-English titles: -{n_lang}")
-
-    # Filter: test/junk
-    pre = len(df)
-    df = df[~df['Title'].apply(is_test_job)]
-    n_test = pre - len(df)
-    print(f"Test/junk postings: -{n_test}")
-
-    total_filtered = n_co + n_lang + n_test
-    print(f"\nAfter filtering: {len(df)} jobs ({total_filtered} removed, {total_filtered/raw*100:.1f}%)")
-
-    # Normalize functions
-    df['Fixed'] = df['Function'].apply(normalize)
-    needs = df['Fixed'].isna()
-    print(f"Inferring from title for {needs.sum()} unmapped departments...")
-    df.loc[needs, 'Fixed'] = df.loc[needs, 'Title'].apply(enhanced_infer_function)
-    unk = len(df[df['Fixed'] == 'Unknown'])
-    print(f"After normalization: {unk} Unknown ({unk/len(df)*100:.1f}%)")
-
-    unmapped = df[(df['Function'] != 'Unknown') & (df['Fixed'] == 'Unknown')]
-    if len(unmapped) > 0:
-        print(f"\nUnmapped departments ({len(unmapped)} jobs):")
-        print(unmapped['Function'].value_counts().head(20))
+    print(f"Raw data: {raw} jobs")
+
+    problems = crawl_problems(df)
+    if problems and not ALLOW_PARTIAL_CRAWL:
+        raise SystemExit("ERROR: Refusing to publish a truncated crawl: " + '; '.join(problems)
+                         + " (set JOBS_ALLOW_PARTIAL=1 to override)")
+    for problem in problems:
+        print(f"  ⚠️  Publishing anyway: {problem}")
+
+    with RUN_REPORT.stage('Filter + Normalize'):
+        # One name per company before anything is counted or deduplicated
+        df['Company'] = canonical_companies(df['Company'])
+        df, (n_co, n_lang, n_test) = filter_jobs(df)
+        total_filtered = n_co + n_lang + n_test
+        print(f"\nAfter filtering: {len(df)} jobs ({total_filtered} removed, {total_filtered/raw*100:.1f}%)")
+
+        # Cross-listed and re-posted jobs count once; fingerprints are saved after publishing
+        fingerprint_store = open_fingerprint_store()
+        df, dupes = dedupe_jobs(df, fingerprint_store)
+        n_dup = dupes['exact'] + dupes['near']
+        print(f"Duplicate postings: -{n_dup} ({dupes['exact']} exact, {dupes['near']} near-duplicate titles)")
+        if fingerprint_store:
+            print(f"New postings: {dupes['new']} ({dupes['reposts']} seen in earlier runs)")
+
+        # MAPPING and VALID are part of the cache version so editing them invalidates it
+        title_cache = attach_cache(ENHANCED_FUNCTION_CLASSIFIER, 'enhanced_function', extra=[MAPPING, VALID])
+        df = normalize_functions(df)
+        if title_cache:
+            title_cache.save()
+        unk = len(df[df['Fixed'] == 'Unknown'])
+        print(f"After normalization: {unk} Unknown ({unk/len(df)*100:.1f}%)")
+
+    unmapped_report(df)
+
+    with RUN_REPORT.stage('Velocity'):
+        # Previous snapshot for velocity: local history, Airtable only as a fallback
+        snapshot_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        history = open_history()
+        previous = None
+        prev_date = history.previous_snapshot(snapshot_date) if history else None
+        if prev_date:
+            previous = {'date': prev_date, **history.snapshot_totals(prev_date)}
+            prev_totals = history.company_totals(prev_date)
+            print(f"\nFound {len(prev_totals)} companies in local snapshot {prev_date}")
+        else:
+            print("\nCapturing previous company totals for velocity tracking...")
+            prev_totals = get_previous_company_totals(api, writer)
+            print(f"  Found {len(prev_totals)} companies from previous week")
 
-    # Capture previous week for velocity
-    print("\nCapturing previous company totals for velocity tracking...")
-    prev_totals = get_previous_company_totals(api)
-    print(f"  Found {len(prev_totals)} companies from previous week")
+    # One aggregation pass feeds every analytics table
+    with RUN_REPORT.stage('Aggregate'):
+        metrics = compute_analytics(df)
 
     # Run pipeline
-    upload_jobs(df, api)
-    update_function_analytics(df, api)
-    update_company_analytics(df, api, prev_totals)
-    create_weekly_snapshot(df, api)
-    update_talent_pooling(df, api)
+    with RUN_REPORT.stage('Jobs'), writer.step('Jobs'):
+        upload_jobs(df, api, writer, history)
+    with RUN_REPORT.stage('Function Analytics'), writer.step('Function Analytics'):
+        update_function_analytics(metrics, api, writer, history)
+    with RUN_REPORT.stage('Company Analytics'), writer.step('Company Analytics'):
+        update_company_analytics(metrics, api, writer, prev_totals, history)
+    with RUN_REPORT.stage('Weekly Snapshot'), writer.step('Weekly Snapshot'):
+        create_weekly_snapshot(metrics, api, writer, previous, history)
+    with RUN_REPORT.stage('Talent Pooling'), writer.step('Talent Pooling'):
+        update_talent_pooling(metrics, api, writer, history)
+    writer.close()
+
+    if history:
+        history.record(snapshot_date, df, metrics)
+        history.close()
+    if fingerprint_store:
+        fingerprint_store.save()
+        fingerprint_store.close()
 
     # Summary
-    roadmap_hits = sum(1 for c in df['Company'].unique() if c in ROADMAP_MAP)
+    roadmap_hits = int((metrics['companies']['roadmap'] != '').sum())
     print("\n" + "=" * 60)
     print("✅ ALL TABLES UPDATED SUCCESSFULLY!")
     print("=" * 60)
     print(f"\n  Base URL: https://airtable.com/{BASE_ID}")
     print(f"  Raw scraped: {raw}")
     print(f"  Filtered out: {total_filtered} ({n_co} excluded co, {n_lang} non-English, {n_test} test)")
+    print(f"  Duplicates: {n_dup} ({dupes['exact']} exact, {dupes['near']} near-duplicate)")
     print(f"  Jobs loaded: {len(df)}")
     print(f"  Unknown: {unk} ({unk/len(df)*100:.1f}%)")
     print(f"  Companies: {df['Company'].nunique()}")
     print(f"  Roadmap mapped: {roadmap_hits}/{df['Company'].nunique()}")
 
+    RUN_REPORT.info.update(raw_jobs=raw, jobs_loaded=len(df), filtered_out=total_filtered,
+                           duplicates=n_dup, reposts=dupes['reposts'])
+    RUN_REPORT.write(LOAD_REPORT_OUTPUT, 'load_jobs_to_airtable.py')
+
 
 if __name__ == "__main__":
     main()
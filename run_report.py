@@ -0,0 +1,80 @@
+import json
+import platform
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class RunReport:
+    """Per-stage wall time, CPU time, peak RSS and counters for one run.
+
+    Counters are process-wide and thread-safe (HTTP requests, bytes,
+    retries, Airtable calls, ...); each stage records how far they moved
+    while it was open. `write()` saves everything as JSON so runs can be
+    compared over time.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.counters = Counter()
+        self.stages = []
+        self.info = {}
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.counters[key] += n
+
+    @contextmanager
+    def stage(self, name):
+        with self.lock:
+            before = self.counters.copy()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            with self.lock:
+                moved = self.counters - before
+            self.stages.append({
+                "stage": name,
+                "wall_seconds": round(time.perf_counter() - wall, 3),
+                "cpu_seconds": round(time.process_time() - cpu, 3),
+                "peak_rss_mb": peak_rss_mb(),
+                **dict(sorted(moved.items())),
+            })
+
+    def write(self, path, script):
+        report = {
+            "script": script,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started)),
+            "wall_seconds": round(time.time() - self.started, 3),
+            "cpu_seconds": round(time.process_time(), 3),
+            "peak_rss_mb": peak_rss_mb(),
+            "python": platform.python_version(),
+            **self.info,
+            "counters": dict(sorted(self.counters.items())),
+            "stages": self.stages,
+        }
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📊 Run report saved to: {path}")
+
+
+# One report per process, shared by the scraper, fetch backends and Airtable writer
+RUN_REPORT = RunReport()
@@ -0,0 +1,61 @@
+import pytest
+from requests.exceptions import ConnectionError
+
+from airtable_writer import BatchWriter
+from fake_airtable import FakeAirtable, http_error
+
+
+def flaky(table, method, error):
+    """Make `method` of `table` fail once with `error` after doing the write."""
+    real = getattr(table, method)
+    calls = []
+
+    def call(*args, **kwargs):
+        result = real(*args, **kwargs)
+        calls.append(result)
+        if len(calls) == 1:
+            raise error
+        return result
+    setattr(table, method, call)
+    return calls
+
+
+@pytest.mark.parametrize('error', [http_error(503, 'SERVER_ERROR', 'down'), ConnectionError('reset')])
+def test_create_not_retried_after_ambiguous_failure(error):
+    base = FakeAirtable(rate=1000)
+    table = base.table('app', 'tblJobs')
+    calls = flaky(table, 'batch_create', error)
+    writer = BatchWriter(rate=1000)
+    with pytest.raises(type(error)):
+        writer.create(table, [{'URL': 'https://a/1'}])
+    assert len(calls) == 1
+    assert len(base.records('tblJobs')) == 1
+
+
+def test_create_retried_after_rate_limit():
+    base = FakeAirtable(rate=1000)
+    table = base.table('app', 'tblJobs')
+    calls = []
+    real = table.batch_create
+
+    def rate_limited_once(records):
+        calls.append(records)
+        if len(calls) == 1:
+            raise http_error(429, 'RATE_LIMIT_REACHED', 'slow down')
+        return real(records)
+    table.batch_create = rate_limited_once
+    writer = BatchWriter(rate=1000)
+    writer.bucket.pause = lambda seconds: None
+    writer.create(table, [{'URL': 'https://a/1'}])
+    assert len(calls) == 2
+    assert len(base.records('tblJobs')) == 1
+
+
+def test_upsert_retried_after_server_error():
+    base = FakeAirtable(rate=1000)
+    table = base.table('app', 'tblJobs')
+    calls = flaky(table, 'batch_upsert', http_error(503, 'SERVER_ERROR', 'down'))
+    writer = BatchWriter(rate=1000)
+    writer.upsert(table, [{'fields': {'URL': 'https://a/1'}}], ['URL'])
+    assert len(calls) == 2
+    assert len(base.records('tblJobs')) == 1
@@ -0,0 +1,119 @@
+"""compute_analytics must produce the same Airtable records as the per-group loops it replaced."""
+from collections import Counter
+
+import pytest
+
+from airtable_writer import BatchWriter
+from bvp_jobs_analyzer import analyze_jobs, apply_output_schema, create_dataframe, project_jobs
+from fake_airtable import FakeAirtable
+from fake_jobs_board import synthetic_jobs
+from load_jobs_to_airtable import (
+    FUNCTION_ANALYTICS_TABLE, ROADMAP_MAP, TALENT_POOLING_TABLE, compute_analytics, normalize_functions,
+    update_function_analytics, update_talent_pooling,
+)
+
+
+# ── Reference implementations (the per-group loops compute_analytics replaced) ──
+
+def reference_function_analytics(df):
+    total_jobs = len(df)
+    records = []
+    for func_name, group in df.groupby('Fixed'):
+        remote_count = len(group[group['Remote'] == 'Yes'])
+        records.append({
+            'Function': str(func_name),
+            'Total Jobs': int(len(group)),
+            'Percentage of Total': len(group) / total_jobs if total_jobs > 0 else 0,
+            'Remote Jobs': int(remote_count),
+            'Remote Percentage': remote_count / len(group) if len(group) > 0 else 0,
+            'Companies Hiring': int(group['Company'].nunique()),
+            'Executive Roles': int(len(group[group['Level'] == 'Executive'])),
+            'Senior Roles': int(len(group[group['Level'] == 'Senior'])),
+        })
+    return records
+
+
+def reference_talent_pooling(df):
+    pool_df = df[df['Fixed'] != 'Unknown'].copy()
+    clusters = []
+    for (func, level), group in pool_df.groupby(['Fixed', 'Level']):
+        companies = sorted(set(group['Company']))
+        n_companies = len(companies)
+        if n_companies < 3:
+            continue
+        total_openings = len(group)
+        remote_count = len(group[group['Remote'] == 'Yes'])
+        remote_pct = remote_count / total_openings if total_openings > 0 else 0
+
+        title_counts = group['Title'].value_counts()
+        sample_titles = []
+        for title, count in title_counts.head(5).items():
+            sample_titles.append(f"{title} ({count})")
+
+        roadmap_companies = [ROADMAP_MAP[c] for c in companies if c in ROADMAP_MAP]
+        roadmap_summary = ''
+        if roadmap_companies:
+            rc = Counter(roadmap_companies).most_common(3)
+            roadmap_summary = ', '.join(f"{rm} ({ct})" for rm, ct in rc)
+
+        if n_companies >= 15:
+            priority = 'Critical (15+ companies)'
+        elif n_companies >= 10:
+            priority = 'High (10-14 companies)'
+        elif n_companies >= 5:
+            priority = 'Medium (5-9 companies)'
+        else:
+            priority = 'Low (3-4 companies)'
+
+        clusters.append({
+            'Role Cluster': f"{level} {func}",
+            'Number of Companies': int(n_companies),
+            'Total Openings': int(total_openings),
+            'Companies': ', '.join(companies),
+            'Function': str(func),
+            'Level': str(level),
+            'Priority': priority,
+            'Sample Titles': '\n'.join(sample_titles),
+            'Remote Percentage': remote_pct,
+            'Top Roadmaps': roadmap_summary,
+        })
+    clusters.sort(key=lambda x: x['Number of Companies'], reverse=True)
+    return clusters
+
+
+# ── Equivalence ─────────────────────────────────────────────
+
+def jobs_frame(n, seed):
+    jobs = project_jobs(synthetic_jobs(n, seed=seed, descriptions=False))
+    _, functions, levels, _ = analyze_jobs(jobs)
+    return normalize_functions(apply_output_schema(create_dataframe(jobs, functions, levels)))
+
+
+def published(step, df, table_id, key):
+    """Records `step` writes for `df`, as stored in a fresh FakeAirtable base."""
+    base = FakeAirtable(rate=1000)
+    step(compute_analytics(df), base, BatchWriter(rate=1000))
+    # Batches are written concurrently, so creation order says nothing
+    records = [{k: v for k, v in r['fields'].items() if k != 'Last Updated'} for r in base.records(table_id)]
+    return sorted(records, key=lambda r: r[key])
+
+
+def stored(records, key):
+    # Airtable drops empty values
+    records = [{k: v for k, v in r.items() if v not in ('', None)} for r in records]
+    return sorted(records, key=lambda r: r[key])
+
+
+@pytest.mark.parametrize('n, seed', [(3000, 0), (20000, 1)])
+def test_analytics_match_reference(n, seed):
+    df = jobs_frame(n, seed)
+    # The loops ran on the CSV as pandas read it then: plain object columns
+    baseline = df.astype(object)
+    # Ties in Sample Titles are where the vectorized version once diverged
+    assert any(
+        title.endswith('(1)') for r in reference_talent_pooling(baseline) for title in r['Sample Titles'].split('\n')
+    )
+    assert published(update_talent_pooling, df, TALENT_POOLING_TABLE, 'Role Cluster') == \
+        stored(reference_talent_pooling(baseline), 'Role Cluster')
+    assert published(update_function_analytics, df, FUNCTION_ANALYTICS_TABLE, 'Function') == \
+        stored(reference_function_analytics(baseline), 'Function')
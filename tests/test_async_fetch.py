@@ -0,0 +1,24 @@
+import threading
+
+from async_fetch import iter_pages_async
+from crawl_checkpoint import CrawlProgress
+from fake_jobs_board import JobsBoard, start_server, synthetic_jobs
+
+
+def test_close_stops_the_crawl(tmp_path):
+    server, url = start_server(JobsBoard(jobs=synthetic_jobs(5000, descriptions=False)), port=0)
+    try:
+        progress = CrawlProgress(url=url, directory=str(tmp_path))
+        pages = iter_pages_async(page_size=100, rate=1000, url=url, progress=progress)
+        next(pages)
+        pages.close()
+
+        # The fetch thread has exited, so nothing is requested or checkpointed from here on
+        assert not [t for t in threading.enumerate() if t.name == 'async-fetch']
+        requests, saved = server.faults.stats['requests'], progress.shards[0].pages
+        assert saved < 50
+        progress.discard()
+        assert server.faults.stats['requests'] == requests
+        assert not any(tmp_path.iterdir())
+    finally:
+        server.shutdown()
@@ -0,0 +1,259 @@
+"""KeywordClassifier must label titles exactly like the if/elif chains it replaced."""
+import pytest
+
+from bvp_jobs_analyzer import FUNCTION_CLASSIFIER, LEVEL_CLASSIFIER
+from fake_jobs_board import synthetic_jobs
+from load_jobs_to_airtable import ENHANCED_FUNCTION_CLASSIFIER
+
+
+# ── Reference implementations (as they were before KeywordClassifier) ──
+
+def infer_function_from_title(title):
+    """Infer function/department from job title when not provided"""
+    if not title:
+        return "Unknown"
+
+    title_lower = title.lower()
+
+    # Finance & Accounting (check early to avoid conflicts with "operations")
+    if any(word in title_lower for word in [
+        'fp&a', 'fpa', 'finance', 'accounting', 'accountant', 'controller', 'cfo',
+        'financial', 'tax', 'audit', 'payroll', 'bookkeeper', 'accounts payable',
+        'accounts receivable', 'treasury'
+    ]):
+        return "Finance"
+
+    # Legal & Compliance (check early)
+    if any(word in title_lower for word in [
+        'legal', 'counsel', 'attorney', 'compliance', 'regulatory',
+        'privacy', 'contracts', 'grc', 'governance'
+    ]):
+        return "Legal & Compliance"
+
+    # People/HR (check before Operations to catch "People Operations")
+    if any(word in title_lower for word in [
+        'recruiter', 'recruiting', 'talent acquisition', 'talent', 'people business partner',
+        'people partner', 'people enablement', 'hr ', 'hrbp', 'human resources',
+        'total rewards', 'people operations', 'people analytics', 'people experience'
+    ]):
+        return "People & Talent"
+
+    # Engineering & Technical
+    if any(word in title_lower for word in [
+        'engineer', 'developer', 'software', 'sre', 'devops', 'architect',
+        'infrastructure', 'backend', 'frontend', 'fullstack', 'full stack',
+        'mobile', 'ios', 'android', 'qa', 'sdet', 'technical program', 'firmware',
+        'embedded', 'hardware engineer', 'test engineer'
+    ]):
+        return "Engineering"
+
+    # Sales & Business Development
+    if any(word in title_lower for word in [
+        'account executive', 'sales', 'business development', 'bdr', 'sdr',
+        'account manager', 'account director', 'partnership manager',
+        'sales development', 'revenue', 'commercial', 'inside sales',
+        'enterprise sales', 'gtm manager', 'relationship manager', 'key account'
+    ]):
+        return "Sales"
+
+    # Marketing (check before Operations)
+    if any(word in title_lower for word in [
+        'marketing', 'growth marketing', 'demand gen', 'content', 'seo',
+        'brand', 'campaigns', 'lifecycle marketing', 'product marketing',
+        'growth marketer', 'social media', 'communications', 'public affairs',
+        'community manager'
+    ]):
+        return "Marketing"
+
+    # Product Management
+    if any(word in title_lower for word in [
+        'product manager', 'product lead', 'product owner',
+        'product director', 'product analyst', 'product designer'
+    ]):
+        # Exclude "product support" and "product operations"
+        if 'support' in title_lower or 'operations' in title_lower:
+            pass  # Will be caught by other categories
+        else:
+            return "Product"
+
+    # Design
+    if any(word in title_lower for word in [
+        'designer', 'design', 'ux', 'ui', 'creative', 'visual'
+    ]):
+        return "Design"
+
+    # Data & Analytics
+    if any(word in title_lower for word in [
+        'data scientist', 'data analyst', 'data engineer', 'analytics',
+        'machine learning', 'ml engineer', 'ai researcher', 'data science',
+        'data specialist', 'data platform'
+    ]):
+        return "Data & Analytics"
+
+    # Customer Success & Support (check before Operations)
+    if any(word in title_lower for word in [
+        'customer success', 'customer experience', 'customer support',
+        'technical support', 'implementation manager', 'customer care',
+        'customer architect', 'customer education', 'support specialist',
+        'support engineer', 'customer strategy'
+    ]):
+        return "Customer Success"
+
+    # IT & Systems
+    if any(word in title_lower for word in [
+        'it support', 'it engineer', 'it administrator', 'it specialist',
+        'systems admin', 'helpdesk', 'desktop support', 'salesforce admin',
+        'it governance', 'it planning', 'it cloud', 'service desk'
+    ]):
+        return "IT"
+
+    # Strategy & Business Development (check before Operations)
+    if any(word in title_lower for word in [
+        'strategy', 'strategic', 'business development', 'partnerships',
+        'corp dev', 'corporate development', 'chief of staff'
+    ]):
+        return "Strategy & Business Development"
+
+    # Operations (check last as it's broad)
+    if any(word in title_lower for word in [
+        'operations', 'ops manager', 'ops specialist', 'ops generalist',
+        'office manager', 'business operations', 'program manager',
+        'project manager', 'executive assistant', 'admin', 'procurement',
+        'process', 'implementation specialist', 'solutions operations',
+        'gtm operations', 'product operations', 'fraud analyst'
+    ]):
+        return "Operations"
+
+    # Professional Services
+    if any(word in title_lower for word in [
+        'professional services', 'consulting', 'consultant', 'solutions architect'
+    ]):
+        return "Professional Services"
+
+    return "Unknown"
+
+
+def infer_level_from_title(title):
+    title_lower = title.lower()
+    if any(word in title_lower for word in ["vp", "vice president", "head of", "chief", "ceo", "cto", "cfo", "coo"]):
+        level = "Executive"
+    elif "director" in title_lower or ("lead" in title_lower and "lead generation" not in title_lower):
+        level = "Director/Lead"
+    elif any(word in title_lower for word in ["senior", "sr.", "sr ", "staff", "principal"]):
+        level = "Senior"
+    elif any(word in title_lower for word in ["junior", "jr.", "jr ", "associate", "entry"]):
+        level = "Junior"
+    else:
+        level = "Mid-Level"
+    return level
+
+
+def enhanced_infer_function(title):
+    """Wrap the scraper's inference with additional patterns."""
+    if not isinstance(title, str):
+        return 'Unknown'
+    lower = title.lower()
+
+    # Clinical patterns (check first — these are specific)
+    clinical_kw = [
+        'counselor', 'therapist', 'clinician', 'nurse', 'physician',
+        'cardiology', 'cardiologist', 'medical director', 'psychiatr',
+        'substance use', 'behavioral health', 'clinical supervisor',
+        'pharmacy', 'pharmacist', 'dietitian', 'nutritionist',
+        'social worker', 'case manager', 'care coordinator',
+        'insurance advisor',
+    ]
+    if any(kw in lower for kw in clinical_kw):
+        return 'Clinical'
+
+    # Additional Engineering patterns
+    eng_kw = ['dba', 'devops', 'sre ', 'site reliability',
+              'tech lead', 'network technician', 'security researcher',
+              'security analyst', 'ml manager', 'machine learning']
+    if any(kw in lower for kw in eng_kw):
+        return 'Engineering'
+
+    # Additional Design patterns
+    if 'interior designer' in lower or 'graphic designer' in lower:
+        return 'Design'
+
+    # Additional Operations patterns
+    ops_kw = ['general affairs', 'purchasing manager', 'barista',
+              'merchandising', 'validation manager', 'regional manager',
+              'operations lead']
+    if any(kw in lower for kw in ops_kw):
+        return 'Operations'
+
+    # Additional Finance patterns
+    fin_kw = ['tax ', 'tax,', 'auditor', 'bookkeep', 'controller',
+              'accounts payable', 'accounts receivable', 'cpa', 'cfo']
+    if any(kw in lower for kw in fin_kw):
+        return 'Finance'
+
+    # Additional Sales patterns
+    if 'business manager - sales' in lower or 'project executive' in lower:
+        return 'Sales'
+
+    # Additional IT patterns
+    if 'it manager' in lower or 'it sox' in lower or 'idc network' in lower:
+        return 'IT'
+
+    # Additional Legal patterns
+    if 'aml ' in lower or 'kyc ' in lower or 'compliance' in lower:
+        return 'Legal & Compliance'
+
+    # Additional Customer Success
+    if 'customer hero' in lower or 'customer protection' in lower:
+        return 'Customer Success'
+
+    # Fall back to the scraper's inference
+    return infer_function_from_title(title)
+
+
+
+# ── Parity ──────────────────────────────────────────────────
+
+# Keywords that are prefixes of others ('sr' / 'sre', 'engineer' / 'engineering',
+# 'tax' / 'tax '), keywords of different rules overlapping in one title, and
+# the `unless` exclusions (product support/operations, lead generation)
+OVERLAP_TITLES = [
+    '', 'SRE', 'Senior SRE', 'Sr Engineer', 'Sr. Data Engineer', 'Sre Manager',
+    'Engineering Manager', 'Software Engineer, Payments', 'Test Engineer', 'Hardware Engineer',
+    'Tax Manager', 'Tax, Senior Manager', 'Taxonomy Specialist', 'Staff Accountant',
+    'Product Manager', 'Product Manager, Support', 'Product Operations Manager',
+    'Product Owner - Operations', 'Senior Product Designer', 'Product Marketing Manager',
+    'Lead Generation Specialist', 'Lead Generation Director', 'Team Lead, Lead Generation',
+    'Head of People Operations', 'HR Business Partner', 'People Operations Partner',
+    'Chief of Staff', 'Chief Financial Officer', 'CFO', 'VP Engineering', 'Vice President, Sales',
+    'Customer Success Engineer', 'Support Engineer', 'Technical Support Specialist',
+    'IT Support Engineer', 'IT Manager', 'Solutions Architect', 'Customer Architect',
+    'Account Executive - Revenue', 'Business Development Representative', 'Partnerships Lead',
+    'Data Scientist, Machine Learning', 'ML Engineer', 'Machine Learning Manager',
+    'AML Analyst', 'KYC Specialist', 'Compliance Counsel', 'Contracts Manager',
+    'Graphic Designer', 'Interior Designer', 'UX Researcher', 'Build Engineer',
+    'Nurse Practitioner', 'Behavioral Health Counselor', 'Case Manager', 'Pharmacist',
+    'Operations Lead', 'Regional Manager', 'Barista', 'Executive Assistant',
+    'Junior Product Designer', 'Associate Director', 'Entry Level Support Specialist',
+    'Principal Architect', 'Jr Analyst', 'Jr. Recruiter', 'Talent Acquisition Partner',
+    'Project Executive', 'Business Manager - Sales', 'Customer Hero', 'Site Reliability Engineer',
+    'DBA', 'Tech Lead', 'Security Analyst', 'CPA', 'Bookkeeper', 'Auditor',
+    'コンサルタント', '영업 매니저',
+]
+
+
+def parity_titles():
+    titles = {job['title'] for job in synthetic_jobs(20000, descriptions=False)}
+    return sorted(titles) + OVERLAP_TITLES
+
+
+@pytest.mark.parametrize('classifier, reference', [
+    (FUNCTION_CLASSIFIER, infer_function_from_title),
+    (LEVEL_CLASSIFIER, infer_level_from_title),
+    (ENHANCED_FUNCTION_CLASSIFIER, enhanced_infer_function),
+], ids=['function', 'level', 'enhanced_function'])
+def test_classifier_matches_reference(classifier, reference, monkeypatch):
+    monkeypatch.setattr(classifier, 'cache', None)
+    titles = parity_titles()
+    expected = [reference(title) for title in titles]
+    assert [classifier.classify(title) for title in titles] == expected
+    assert classifier.classify_distinct(titles, workers=1) == expected
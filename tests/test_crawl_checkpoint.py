@@ -0,0 +1,62 @@
+import os
+from itertools import islice
+
+from bvp_jobs_analyzer import fetch_pages
+from crawl_checkpoint import CrawlProgress
+from fake_jobs_board import JobsBoard, synthetic_jobs
+from rate_limiter import TokenBucket
+
+
+class BoardSession:
+    """requests.Session stand-in answering search-jobs POSTs from a JobsBoard."""
+
+    def __init__(self, board):
+        self.board = board
+
+    def post(self, url, json, timeout=None):
+        page = self.board.page(json)
+        return type('Response', (), {'status_code': 200, 'content': b'', 'json': lambda self: page})()
+
+
+def crawl(session, directory, pages=None):
+    shard = CrawlProgress(url='http://board', directory=directory).shards[0]
+    got = list(islice(fetch_pages(session, TokenBucket(1000), page_size=100, checkpoint=shard), pages))
+    return [job['id'] for data in got for job in data['jobs']], shard
+
+
+def interrupted_crawl(tmp_path):
+    session = BoardSession(JobsBoard(jobs=synthetic_jobs(1000, descriptions=False)))
+    directory = str(tmp_path / 'crawl')
+    crawl(session, directory, pages=3)
+    (shard_dir,) = os.listdir(directory)
+    return session, directory, os.path.join(directory, shard_dir)
+
+
+def test_resume_replays_saved_pages(tmp_path):
+    session, directory, _ = interrupted_crawl(tmp_path)
+    ids, shard = crawl(session, directory)
+    assert len(ids) == len(set(ids)) == 1000
+    assert shard.complete
+
+
+def test_checkpoint_with_missing_page_restarts(tmp_path):
+    session, directory, shard_dir = interrupted_crawl(tmp_path)
+    os.remove(os.path.join(shard_dir, 'page_0001.json'))
+
+    assert CrawlProgress(url='http://board', directory=directory).shards[0].pages == 0
+    assert not os.path.exists(shard_dir)
+    ids, shard = crawl(session, directory)
+    assert len(ids) == len(set(ids)) == 1000
+    assert shard.complete and shard.pages == 10
+
+
+def test_page_removed_after_load_restarts(tmp_path):
+    session, directory, shard_dir = interrupted_crawl(tmp_path)
+    shard = CrawlProgress(url='http://board', directory=directory).shards[0]
+    assert shard.pages == 3
+    os.remove(os.path.join(shard_dir, 'page_0002.json'))
+
+    got = list(fetch_pages(session, TokenBucket(1000), page_size=100, checkpoint=shard))
+    ids = [job['id'] for data in got for job in data['jobs']]
+    assert len(ids) == len(set(ids)) == 1000
+    assert shard.complete and shard.pages == 10
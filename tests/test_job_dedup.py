@@ -0,0 +1,54 @@
+import pandas as pd
+
+from job_dedup import FingerprintStore, dedupe_jobs
+
+
+def jobs(*rows):
+    return pd.DataFrame(rows, columns=['Title', 'Company', 'Location', 'URL'])
+
+
+def test_exact_url_and_near_duplicates():
+    df = jobs(
+        ('Senior Software Engineer', 'Acme', 'NYC', 'https://a/1'),
+        ('Sr. Software Engineer', 'ACME', 'nyc', 'https://b/1'),      # same key once normalized
+        ('Software Engineer II', 'Acme', 'NYC', 'https://a/1'),       # same URL
+        ('Senior Software Engineers', 'Acme', 'NYC', 'https://a/2'),  # spelling variant
+        ('Senior Software Engineer', 'Acme', 'London', 'https://a/3'),
+        ('Software Engineer, AI', 'Acme', 'NYC', 'https://a/4'),
+    )
+    kept, counts = dedupe_jobs(df)
+    assert kept['URL'].tolist() == ['https://a/1', 'https://a/3', 'https://a/4']
+    assert counts == {'exact': 2, 'near': 1, 'new': 3, 'reposts': 0}
+
+
+def test_repost_keeps_first_seen(tmp_path):
+    path = str(tmp_path / 'fingerprints.sqlite')
+    store = FingerprintStore(path)
+    dedupe_jobs(jobs(('Data Engineer', 'Acme', 'NYC', 'https://a/1')), store)
+    store.save(today='2026-01-05')
+
+    store = FingerprintStore(path)
+    kept, counts = dedupe_jobs(jobs(
+        ('Data Engineer', 'Acme', 'NYC', 'https://a/9'),
+        ('Product Manager', 'Acme', 'NYC', 'https://a/10'),
+    ), store)
+    assert len(kept) == 2
+    assert counts['new'] == 1 and counts['reposts'] == 1
+    assert [row[-1] for row in store.pending] == ['2026-01-05', None]
+
+
+def test_history_does_not_bridge_live_postings(tmp_path):
+    path = str(tmp_path / 'fingerprints.sqlite')
+    store = FingerprintStore(path)
+    dedupe_jobs(jobs(('Senior Backend Engineer Payments', 'Acme', 'NYC', 'https://a/1')), store)
+    store.save(today='2026-01-05')
+
+    # Each title is a near-duplicate of the stored one, but not of each other
+    live = jobs(
+        ('Senior Backend Engineers Payments', 'Acme', 'NYC', 'https://a/2'),
+        ('Senior Backend Engineer Paymentz', 'Acme', 'NYC', 'https://a/3'),
+    )
+    assert dedupe_jobs(live)[1]['near'] == 0
+    kept, counts = dedupe_jobs(live, FingerprintStore(path))
+    assert len(kept) == 2
+    assert counts == {'exact': 0, 'near': 0, 'new': 0, 'reposts': 2}
@@ -0,0 +1,56 @@
+from airtable_writer import BatchWriter
+from fake_airtable import FakeAirtable
+from load_jobs_to_airtable import job_key, sync_table
+
+
+def job(url, title, company='Acme', location='NYC'):
+    return {'URL': url, 'Job Title': title, 'Company': company, 'Location': location}
+
+
+def rows(base):
+    return sorted((r['fields'].get('URL', ''), r['fields']['Job Title']) for r in base.records('tblJobs'))
+
+
+def sync(base, records):
+    table = base.table('app', 'tblJobs')
+    return sync_table(table, records, job_key, BatchWriter(rate=1000), key_fields=['URL'])
+
+
+def test_sync_adds_changes_and_removes():
+    base = FakeAirtable(rate=1000)
+    first = [
+        job('https://a/1', 'Engineer'),
+        job('https://a/2', 'Designer'),
+        job('https://a/3', 'Recruiter'),
+        # Cross-listed under one URL: both rows are kept
+        job('https://a/4', 'Analyst'),
+        job('https://a/4', 'Data Analyst'),
+        # No URL: matched on company + title + location
+        job('', 'Office Manager'),
+    ]
+    assert sync(base, first) == (6, 0, 0)
+
+    second = [
+        job('https://a/1', 'Senior Engineer'),   # changed
+        job('https://a/2', 'Designer'),          # unchanged
+        job('https://a/4', 'Analyst'),
+        job('https://a/4', 'Data Analyst'),
+        job('', 'Office Manager'),
+        job('https://a/5', 'Account Executive'),  # added; https://a/3 removed
+    ]
+    assert sync(base, second) == (1, 1, 1)
+    assert rows(base) == sorted((r['URL'], r['Job Title']) for r in second)
+
+    # A rerun with the same records writes nothing
+    before = base.stats['requests']
+    assert sync(base, second) == (0, 0, 0)
+    assert base.stats['requests'] - before == 1  # the one page read
+
+
+def test_sync_reuses_rows_with_repeated_urls():
+    base = FakeAirtable(rate=1000)
+    records = [job('https://a/1', 'Engineer'), job('https://a/1', 'Engineer, Platform')]
+    assert sync(base, records) == (2, 0, 0)
+    records[1] = job('https://a/1', 'Engineer, Infra')
+    assert sync(base, records) == (0, 1, 0)
+    assert rows(base) == [('https://a/1', 'Engineer'), ('https://a/1', 'Engineer, Infra')]
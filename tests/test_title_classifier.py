@@ -0,0 +1,67 @@
+import title_classifier
+from title_classifier import KeywordClassifier, attach_cache
+
+
+def make_classifiers():
+    function = KeywordClassifier([('Engineering', ['engineer']), ('Sales', ['account exec'])], 'Other')
+    level = KeywordClassifier([('Senior', ['senior']), ('Junior', ['junior'])], 'Mid-Level')
+    return function, level
+
+
+def test_two_caches_share_one_file(tmp_path):
+    path = str(tmp_path / 'titles.sqlite')
+    function, level = make_classifiers()
+    function_cache = attach_cache(function, 'function', path=path)
+    level_cache = attach_cache(level, 'level', path=path)
+
+    assert function.classify('Senior Engineer') == 'Engineering'
+    assert level.classify('Senior Engineer') == 'Senior'
+    function_cache.save()
+    level_cache.save()
+
+    # Still attached after saving: later results are cached and saved too
+    assert function.classify('Account Executive') == 'Sales'
+    function_cache.save()
+
+    function, level = make_classifiers()
+    function_cache = attach_cache(function, 'function', path=path)
+    level_cache = attach_cache(level, 'level', path=path)
+    assert function_cache.labels == {'senior engineer': 'Engineering', 'account executive': 'Sales'}
+    assert level_cache.labels == {'senior engineer': 'Senior'}
+
+
+def test_cache_dropped_when_rules_change(tmp_path):
+    path = str(tmp_path / 'titles.sqlite')
+    function, _ = make_classifiers()
+    cache = attach_cache(function, 'function', path=path)
+    function.classify('Senior Engineer')
+    cache.save()
+
+    edited = KeywordClassifier([('Engineering', ['engineer', 'developer'])], 'Other')
+    assert attach_cache(edited, 'function', path=path).labels == {}
+
+
+def test_worker_count_respects_threshold(monkeypatch):
+    monkeypatch.setattr(title_classifier, 'CLASSIFY_WORKERS', 4)
+    assert title_classifier.parallel_workers(100) == 1
+    assert title_classifier.parallel_workers(title_classifier.PARALLEL_MIN_TITLES) == 4
+
+
+def test_invalid_worker_env_is_ignored(monkeypatch):
+    for value in ('four', '-2', ''):
+        monkeypatch.setenv('CLASSIFY_WORKERS', value)
+        assert title_classifier._env_workers('CLASSIFY_WORKERS') == 0
+    monkeypatch.setenv('CLASSIFY_WORKERS', '3')
+    assert title_classifier._env_workers('CLASSIFY_WORKERS') == 3
+
+
+def test_no_pool_when_every_title_is_cached(tmp_path, monkeypatch):
+    function, _ = make_classifiers()
+    attach_cache(function, 'function', path=str(tmp_path / 'titles.sqlite'))
+    titles = ['Senior Engineer', 'Account Executive', None]
+    expected = function.classify_distinct(titles, workers=1)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError('started a process pool')
+    monkeypatch.setattr(title_classifier, 'ProcessPoolExecutor', no_pool)
+    assert function.classify_distinct(titles, workers=4) == expected
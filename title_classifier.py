@@ -0,0 +1,338 @@
+import functools
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+# Shared on-disk cache; set TITLE_CACHE_PATH='' to disable persistence
+TITLE_CACHE_PATH = os.environ.get('TITLE_CACHE_PATH', '.cache/title_classifications.sqlite')
+
+# In-process memo entries per classifier
+LRU_SIZE = 65536
+
+
+def _env_workers(name):
+    """Non-negative worker count from the environment; 0 when unset or invalid."""
+    value = os.environ.get(name, '').strip()
+    if not value:
+        return 0
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = -1
+    if workers < 0:
+        print(f"  ⚠️  Ignoring {name}={value!r}: expected a whole number >= 0")
+        return 0
+    return workers
+
+
+# Worker processes for large batches: 0 picks one per available core, 1 is serial
+CLASSIFY_WORKERS = _env_workers('CLASSIFY_WORKERS')
+# Distinct titles a batch needs before it is worth starting workers, and per chunk
+PARALLEL_MIN_TITLES = 20000
+PARALLEL_CHUNK_TITLES = 5000
+
+
+class KeywordClassifier:
+    """Precompiled replacement for a chain of `any(word in title_lower ...)` checks.
+
+    `rules` is an ordered list of (label, keywords) or (label, keywords, unless)
+    tuples. A title gets the label of the first rule that has one of its
+    keywords as a substring of the lowercased title, exactly like the chained
+    checks it replaces; a rule is skipped when any of its `unless` words is
+    present. Titles with no match get `default`.
+
+    All keywords are compiled into one trie-shaped regex that reports the
+    longest keyword starting at each position, so a title is scanned once no
+    matter how many rules there are.
+    """
+
+    def __init__(self, rules, default):
+        self.rules = [(label, tuple(keywords), tuple(unless[0]) if unless else ())
+                      for label, keywords, *unless in rules]
+        self.default = default
+        self.labels = [label for label, _, _ in self.rules]
+
+        keywords = {kw for _, kws, _ in self.rules for kw in kws}
+        # Zero-width lookahead so findall reports a match at every position
+        self.pattern = re.compile('(?=(' + _trie_regex(keywords) + '))')
+
+        # Keywords that are prefixes of each keyword: when the longest match at a
+        # position is K, every keyword in prefixes[K] matched there as well
+        self.prefixes = {kw: [p for p in keywords if kw.startswith(p)] for kw in keywords}
+        self.conditional = [(i, unless) for i, (_, _, unless) in enumerate(self.rules) if unless]
+        self._ranks = {}
+
+        # Changes whenever the rules or default change; keys the persistent cache
+        self.version = _digest([self.rules, self.default])
+        self.cache = None
+        self._lookup = functools.lru_cache(maxsize=LRU_SIZE)(self._classify_lower)
+
+    def __getstate__(self):
+        # Worker processes get the compiled rules, not the memo or the SQLite cache
+        state = self.__dict__.copy()
+        del state['_lookup']
+        state['cache'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lookup = functools.lru_cache(maxsize=LRU_SIZE)(self._classify_lower)
+
+    def _ranks_for(self, disabled):
+        """Map each keyword to the best (lowest) rule index it triggers."""
+        ranks = self._ranks.get(disabled)
+        if ranks is None:
+            first = {}
+            for i, (_, keywords, _) in enumerate(self.rules):
+                if i in disabled:
+                    continue
+                for kw in keywords:
+                    first.setdefault(kw, i)
+            ranks = {}
+            for kw, prefixes in self.prefixes.items():
+                hits = [first[p] for p in prefixes if p in first]
+                if hits:
+                    ranks[kw] = min(hits)
+            self._ranks[disabled] = ranks
+        return ranks
+
+    def classify(self, title):
+        """Return the label for one title."""
+        if not isinstance(title, str) or not title:
+            return self.default
+        # Results depend only on the lowercased title, so that is the cache key
+        return self._lookup(title.lower())
+
+    def _classify_lower(self, lower):
+        if self.cache is not None:
+            label = self.cache.get(lower)
+            if label is not None:
+                return label
+        label = self._match(lower)
+        if self.cache is not None:
+            self.cache.put(lower, label)
+        return label
+
+    def _match(self, lower):
+        found = self.pattern.findall(lower)
+        if not found:
+            return self.default
+
+        disabled = frozenset(
+            i for i, unless in self.conditional if any(word in lower for word in unless)
+        )
+        ranks = self._ranks_for(disabled)
+        best = min((ranks[kw] for kw in found if kw in ranks), default=None)
+        return self.default if best is None else self.labels[best]
+
+    def classify_many(self, titles):
+        """Classify a batch of titles, doing the work once per distinct title."""
+        labels = {}
+        out = []
+        for title in titles:
+            try:
+                label = labels[title]
+            except KeyError:
+                label = labels[title] = self.classify(title)
+            except TypeError:  # unhashable input
+                label = self.default
+            out.append(label)
+        return out
+
+    def classify_series(self, titles):
+        """Vectorized `classify` over a pandas Series, aligned to its index.
+
+        Titles are factorized into categorical codes, each distinct title is
+        classified once and the labels are broadcast back with one take.
+        """
+        codes, uniques = pd.factorize(titles)
+        # Code -1 (missing title) picks the trailing default
+        labels = np.array(self.classify_distinct(uniques) + [self.default], dtype=object)
+        return pd.Series(labels[codes], index=titles.index, name=titles.name)
+
+    def classify_distinct(self, titles, workers=None):
+        """Labels for a list of distinct titles, in order.
+
+        Large batches are split into chunks classified on a process pool
+        (see parallel_workers); results are identical to `classify`. The
+        persistent cache is consulted and filled here, in the parent.
+        """
+        titles = list(titles)
+        workers = parallel_workers(len(titles)) if workers is None else workers
+        if workers <= 1:
+            return [self.classify(t) for t in titles]
+
+        labels = [self.default] * len(titles)
+        todo, lowers = [], []
+        for i, title in enumerate(titles):
+            if not isinstance(title, str) or not title:
+                continue
+            lower = title.lower()
+            label = self.cache.get(lower) if self.cache is not None else None
+            if label is None:
+                todo.append(i)
+                lowers.append(lower)
+            else:
+                labels[i] = label
+        if not lowers:
+            return labels
+        chunks = [lowers[i:i + PARALLEL_CHUNK_TITLES] for i in range(0, len(lowers), PARALLEL_CHUNK_TITLES)]
+        with ProcessPoolExecutor(min(workers, len(chunks)), initializer=_init_worker,
+                                 initargs=(self,)) as pool:
+            matched = [label for chunk in pool.map(_match_chunk, chunks) for label in chunk]
+        for i, lower, label in zip(todo, lowers, matched):
+            labels[i] = label
+            if self.cache is not None:
+                self.cache.put(lower, label)
+        return labels
+
+
+def available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+def parallel_workers(n_titles):
+    """Processes to classify `n_titles` distinct titles with (1 means serial).
+
+    Batches below PARALLEL_MIN_TITLES always stay serial. Larger ones get
+    CLASSIFY_WORKERS when set, else one worker per available core, each
+    with at least PARALLEL_CHUNK_TITLES titles.
+    """
+    if n_titles < PARALLEL_MIN_TITLES:
+        return 1
+    if CLASSIFY_WORKERS:
+        return CLASSIFY_WORKERS
+    return max(1, min(available_cpus(), n_titles // PARALLEL_CHUNK_TITLES))
+
+
+# The classifier each worker process matches with, set once by the pool initializer
+_worker_classifier = None
+
+
+def _init_worker(classifier):
+    global _worker_classifier
+    _worker_classifier = classifier
+
+
+def _match_chunk(lowers):
+    return [_worker_classifier._match(lower) for lower in lowers]
+
+
+class ClassificationCache:
+    """Title → label results for one classifier, persisted in SQLite.
+
+    Rows are keyed by classifier name and ruleset version; rows from any
+    other version of the same classifier are dropped on open, so editing a
+    keyword list (or anything passed as `extra`) invalidates the cache.
+    """
+
+    def __init__(self, path, name, ruleset):
+        self.name = name
+        self.ruleset = ruleset
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        # Commit straight away: an open write transaction would lock out the
+        # other classifiers' caches sharing this file
+        with self.conn:
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS classifications ('
+                'name TEXT, ruleset TEXT, title TEXT, label TEXT, '
+                'PRIMARY KEY (name, ruleset, title))'
+            )
+            self.conn.execute(
+                'DELETE FROM classifications WHERE name = ? AND ruleset != ?', (name, ruleset)
+            )
+            self.labels = dict(self.conn.execute(
+                'SELECT title, label FROM classifications WHERE name = ? AND ruleset = ?',
+                (name, ruleset),
+            ))
+        self.loaded = len(self.labels)
+        self.pending = {}
+        self.hits = 0
+
+    def get(self, title):
+        label = self.labels.get(title)
+        if label is not None:
+            self.hits += 1
+        return label
+
+    def put(self, title, label):
+        self.labels[title] = label
+        self.pending[title] = label
+
+    def save(self):
+        """Write new entries to disk.
+
+        The connection stays open: the classifier still holds this cache and
+        may add (and save) more entries later in the run.
+        """
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO classifications VALUES (?, ?, ?, ?)',
+                [(self.name, self.ruleset, t, label) for t, label in self.pending.items()],
+            )
+        print(f"  Title cache '{self.name}': {self.hits} hits, "
+              f"{len(self.pending)} new, {self.loaded + len(self.pending)} stored")
+        self.loaded += len(self.pending)
+        self.pending = {}
+
+
+def attach_cache(classifier, name, extra=None, path=None):
+    """Back `classifier` with the on-disk cache; returns it, or None if disabled.
+
+    `extra` is any other data the caller's results depend on (e.g. MAPPING);
+    it is folded into the ruleset version.
+    """
+    path = TITLE_CACHE_PATH if path is None else path
+    if not path:
+        return None
+    ruleset = _digest([classifier.version, extra]) if extra is not None else classifier.version
+    classifier.cache = ClassificationCache(path, name, ruleset)
+    return classifier.cache
+
+
+def _digest(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=sorted).encode()).hexdigest()[:16]
+
+
+def _trie_regex(words):
+    """Regex matching the longest of `words` that starts at the match position."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return _node_regex(trie)
+
+
+def _node_regex(node):
+    branches = []
+    for char in sorted(k for k in node if k):
+        child = node[char]
+        prefix = re.escape(char)
+        # Collapse single-child chains into one literal run
+        while len(child) == 1 and '' not in child:
+            (next_char, child), = child.items()
+            prefix += re.escape(next_char)
+        rest = _node_regex(child)
+        branches.append(prefix + rest)
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # A keyword ends here; try to extend it first (greedy) for the longest match
+        return '(?:' + body + ')?'
+    return body